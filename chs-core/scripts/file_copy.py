@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+发布与保护脚本共用的文件复制工具
+
+protect_code.py 与 publish_core.py 都通过本模块复制文件，保证两处的复制行为一致。
+"""
+
+import os
+import stat
+import sys
+from typing import Optional
+
+# 内核复制不可用或提前结束时，普通读写复制使用的缓冲区大小
+COPY_BUFSIZE = 1024 * 1024
+
+
+def _copy_remaining(fsrc, fdst):
+    """
+    从两个文件描述符的当前偏移处起，用缓冲区循环复制剩余内容
+    
+    Args:
+        fsrc: 已打开的源文件对象
+        fdst: 已打开的目标文件对象
+    """
+    # 内核复制只推进了文件描述符的偏移，先让文件对象与之对齐
+    fsrc.seek(os.lseek(fsrc.fileno(), 0, os.SEEK_CUR))
+    fdst.seek(os.lseek(fdst.fileno(), 0, os.SEEK_CUR))
+    
+    buf = bytearray(COPY_BUFSIZE)
+    view = memoryview(buf)
+    readinto = fsrc.readinto
+    write = fdst.write
+    while True:
+        n = readinto(buf)
+        if not n:
+            break
+        write(view[:n])
+
+
+def fast_copy(src, dst, src_stat: Optional[os.stat_result] = None):
+    """
+    复制文件内容及元数据（权限和访问/修改时间，同shutil.copy2）
+    
+    Windows上直接调用CopyFileW在内核态完成复制；Linux上优先使用os.copy_file_range，
+    内核复制不可用或提前返回0时，从当前偏移处改为缓冲区读写复制剩余内容，不会留下截断的文件；
+    其他平台使用1MiB缓冲区readinto循环复制。dst为目录时复制到该目录下的同名文件。
+    
+    Args:
+        src: 源文件路径
+        dst: 目标文件路径或目录
+        src_stat: 已获取的源文件stat结果，提供时不再重复stat源文件
+    
+    Returns:
+        目标文件路径
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    
+    if sys.platform == "win32":
+        import ctypes
+        if ctypes.windll.kernel32.CopyFileW(str(src), str(dst), False):
+            return dst
+    
+    if src_stat is None:
+        src_stat = os.stat(src)
+    
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        remaining = src_stat.st_size
+        if hasattr(os, "copy_file_range"):
+            in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(in_fd, out_fd, remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            except OSError:
+                # 跨文件系统或内核不支持（EXDEV/ENOSYS等）
+                pass
+        # 文件在复制过程中变长时也一并复制到末尾
+        _copy_remaining(fsrc, fdst)
+    
+    os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+    os.chmod(dst, stat.S_IMODE(src_stat.st_mode))
+    return dst
+
+
+def link_or_copy(src, dst):
+    """
+    以硬链接方式复用已生成的文件，跨文件系统等无法链接时退回复制
+    
+    Args:
+        src: 源文件路径
+        dst: 目标文件路径
+    
+    Returns:
+        目标文件路径
+    """
+    try:
+        if os.path.lexists(dst):
+            os.unlink(dst)
+        os.link(src, dst)
+    except OSError:
+        fast_copy(src, dst)
+    return dst
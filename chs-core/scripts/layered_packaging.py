@@ -19,8 +19,10 @@ import os
 import sys
 import shutil
 import json
+import hashlib
 import argparse
 import logging
+import string
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Set
 from datetime import datetime
@@ -34,6 +36,196 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 分发包README模板（模块级常量，避免每次调用重新构建f-string）
+_README_TEMPLATE = string.Template("""\
+# CHS-Core $strategy_title 分发包
+
+这是 CHS-Core 的 $strategy 分发包，包含以下组件：
+
+$layer_list
+
+## 快速安装
+
+### 自动安装（推荐）
+
+```bash
+# Windows
+install.bat
+
+# Linux/macOS
+./install.sh
+
+# 或者直接使用Python
+python install.py
+```
+
+### 手动安装
+
+按以下顺序安装各个组件：
+
+$manual_steps
+
+## 组件说明
+
+$component_descriptions
+
+## 系统要求
+
+- Python 3.8+
+- pip
+
+## 验证安装
+
+```python
+# 验证API层
+import chs_core_api
+print("API层安装成功")
+
+# 验证其他组件
+# TODO: 添加具体的验证代码
+```
+
+## 故障排除
+
+### 常见问题
+
+1. **权限错误**: 使用 `sudo` 或管理员权限运行安装脚本
+2. **依赖冲突**: 建议使用虚拟环境安装
+3. **网络问题**: 检查网络连接和pip源配置
+
+### 获取帮助
+
+如果遇到问题，请：
+
+1. 检查 `distribution_info.json` 中的详细信息
+2. 查看安装日志
+3. 联系 CHS-Core 团队
+
+## 许可证
+
+MIT License
+
+## 版本信息
+
+- 分发策略: $strategy
+- 创建时间: $now
+- 包含层级: $layer_count 个
+""")
+
+
+# 安装脚本模板（Python/批处理/Shell 共用同一组字段）
+_INSTALL_PY_TEMPLATE = '''\
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CHS-Core {title} 分发包安装脚本
+
+此脚本自动安装 CHS-Core {strategy} 分发包中的所有组件。
+"""
+
+import os
+import sys
+import subprocess
+from pathlib import Path
+
+# 状态输出缓冲，每个层级只写一次stdout
+_log_batch = []
+
+def _flush_log():
+    """一次性输出缓冲的状态信息"""
+    if _log_batch:
+        sys.stdout.write("\\n".join(_log_batch) + "\\n")
+        sys.stdout.flush()
+        _log_batch.clear()
+
+def install_layer(layer_name):
+    """安装指定层级"""
+    layer_dir = Path(__file__).parent / layer_name
+    
+    if not layer_dir.exists():
+        _log_batch.append(f"错误: 层级目录不存在: {{layer_dir}}")
+        return False
+    
+    setup_file = layer_dir / "setup.py"
+    if not setup_file.exists():
+        _log_batch.append(f"错误: setup.py不存在: {{setup_file}}")
+        return False
+    
+    _log_batch.append(f"安装层级: {{layer_name}}")
+    
+    try:
+        # 运行pip install
+        cmd = [sys.executable, "-m", "pip", "install", "-e", str(layer_dir)]
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        _log_batch.append(f"✓ {{layer_name}} 安装成功")
+        return True
+    except subprocess.CalledProcessError as e:
+        _log_batch.append(f"❌ {{layer_name}} 安装失败: {{e}}")
+        _log_batch.append(f"错误输出: {{e.stderr}}")
+        return False
+
+def main():
+    """主安装函数"""
+    _log_batch.append("🚀 开始安装 CHS-Core {title} 分发包...")
+    # 开始信息立即输出，不等第一个层级的pip安装结束
+    _flush_log()
+    
+    layers_to_install = {layers}
+    
+    success_count = 0
+    total_count = len(layers_to_install)
+    
+    for layer_name in layers_to_install:
+        if install_layer(layer_name):
+            success_count += 1
+        else:
+            _log_batch.append(f"警告: 层级安装失败: {{layer_name}}")
+        _flush_log()
+    
+    _log_batch.append(f"\\n安装完成: {{success_count}}/{{total_count}} 个层级安装成功")
+    
+    if success_count == total_count:
+        _log_batch.append("🎉 所有组件安装成功！")
+        _flush_log()
+        return 0
+    else:
+        _log_batch.append("⚠️ 部分组件安装失败，请检查错误信息")
+        _flush_log()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
+'''
+
+_INSTALL_BAT_TEMPLATE = '''\
+@echo off
+echo 安装 CHS-Core {title} 分发包...
+
+python install.py
+
+if %ERRORLEVEL% EQU 0 (
+    echo 安装成功！
+    pause
+) else (
+    echo 安装失败！
+    pause
+)
+'''
+
+_INSTALL_SH_TEMPLATE = '''\
+#!/bin/bash
+echo "安装 CHS-Core {title} 分发包..."
+
+python3 install.py
+
+if [ $? -eq 0 ]; then
+    echo "安装成功！"
+else
+    echo "安装失败！"
+    exit 1
+fi
+'''
+
 
 class LayeredPackageManager:
     """
@@ -129,9 +321,12 @@ class LayeredPackageManager:
             "production": ["api", "core", "algorithms", "config"]
         }
         
-        logger.info(f"分层包管理器初始化完成")
-        logger.info(f"项目根目录: {self.project_root}")
-        logger.info(f"输出目录: {self.output_dir}")
+        # 复制层级文件时记录的源文件状态: 层级名称 -> [(相对路径, mtime_ns, 大小)]
+        self._layer_source_state: Dict[str, List[tuple]] = {}
+        
+        logger.info("分层包管理器初始化完成")
+        logger.info("项目根目录: %s", self.project_root)
+        logger.info("输出目录: %s", self.output_dir)
     
     def create_layer(self, layer_name: str, force: bool = False) -> bool:
         """
@@ -146,11 +341,11 @@ class LayeredPackageManager:
         """
         try:
             if layer_name not in self.layers:
-                logger.error(f"未知的层级: {layer_name}")
+                logger.error("未知的层级: %s", layer_name)
                 return False
             
             layer_config = self.layers[layer_name]
-            logger.info(f"🏗️ 创建层级包: {layer_config['name']} ({layer_name})")
+            logger.info("🏗️ 创建层级包: %s (%s)", layer_config['name'], layer_name)
             
             # 创建层级目录
             layer_dir = self.output_dir / layer_name
@@ -161,29 +356,29 @@ class LayeredPackageManager:
             
             # 复制文件
             if not self._copy_layer_files(layer_name, layer_dir):
-                logger.error(f"复制层级文件失败: {layer_name}")
+                logger.error("复制层级文件失败: %s", layer_name)
                 return False
             
             # 应用保护
             if not self._apply_layer_protection(layer_name, layer_dir):
-                logger.error(f"应用层级保护失败: {layer_name}")
+                logger.error("应用层级保护失败: %s", layer_name)
                 return False
             
             # 创建包配置
             if not self._create_layer_package_config(layer_name, layer_dir):
-                logger.error(f"创建包配置失败: {layer_name}")
+                logger.error("创建包配置失败: %s", layer_name)
                 return False
             
             # 创建层级元数据
             if not self._create_layer_metadata(layer_name, layer_dir):
-                logger.error(f"创建层级元数据失败: {layer_name}")
+                logger.error("创建层级元数据失败: %s", layer_name)
                 return False
             
-            logger.info(f"✓ 层级包创建完成: {layer_name}")
+            logger.info("✓ 层级包创建完成: %s", layer_name)
             return True
             
         except Exception as e:
-            logger.error(f"创建层级包失败 {layer_name}: {e}")
+            logger.error("创建层级包失败 %s: %s", layer_name, e)
             return False
     
     def create_all_layers(self, force: bool = False) -> bool:
@@ -209,13 +404,13 @@ class LayeredPackageManager:
                 if self.create_layer(layer_name, force):
                     success_count += 1
                 else:
-                    logger.warning(f"层级创建失败: {layer_name}")
+                    logger.warning("层级创建失败: %s", layer_name)
             
-            logger.info(f"层级包创建完成: {success_count}/{total_count}")
+            logger.info("层级包创建完成: %s/%s", success_count, total_count)
             return success_count == total_count
             
         except Exception as e:
-            logger.error(f"创建所有层级包失败: {e}")
+            logger.error("创建所有层级包失败: %s", e)
             return False
     
     def create_distribution(self, strategy: str, force: bool = False) -> bool:
@@ -231,46 +426,173 @@ class LayeredPackageManager:
         """
         try:
             if strategy not in self.distribution_strategies:
-                logger.error(f"未知的分发策略: {strategy}")
+                logger.error("未知的分发策略: %s", strategy)
                 return False
             
             layers_to_include = self.distribution_strategies[strategy]
-            logger.info(f"📦 创建分发包: {strategy} (包含层级: {layers_to_include})")
+            logger.info("📦 创建分发包: %s (包含层级: %s)", strategy, layers_to_include)
             
             # 创建分发目录
             dist_dir = self.output_dir / f"distribution_{strategy}"
+            fingerprint_file = dist_dir / ".fingerprint"
+            
+            # 分发包已是最新则跳过重新生成；强制重建时不计算指纹
+            fingerprint = None
+            if not force:
+                fingerprint = self._compute_distribution_fingerprint(strategy, layers_to_include)
+                if self._is_distribution_current(dist_dir, fingerprint):
+                    logger.info("分发包已是最新，跳过: %s", strategy)
+                    return True
+            
             if dist_dir.exists() and force:
                 shutil.rmtree(dist_dir)
             
             dist_dir.mkdir(parents=True, exist_ok=True)
+            # 重建未完成前移除旧指纹
+            fingerprint_file.unlink(missing_ok=True)
             
             # 创建各个层级
             for layer_name in layers_to_include:
                 if not self.create_layer(layer_name, force):
-                    logger.error(f"创建层级失败: {layer_name}")
+                    logger.error("创建层级失败: %s", layer_name)
                     return False
             
             # 组装分发包
             if not self._assemble_distribution(strategy, dist_dir, layers_to_include):
-                logger.error(f"组装分发包失败: {strategy}")
+                logger.error("组装分发包失败: %s", strategy)
                 return False
             
             # 创建安装脚本
             if not self._create_installation_scripts(strategy, dist_dir):
-                logger.error(f"创建安装脚本失败: {strategy}")
+                logger.error("创建安装脚本失败: %s", strategy)
                 return False
             
             # 创建分发元数据
             if not self._create_distribution_metadata(strategy, dist_dir, layers_to_include):
-                logger.error(f"创建分发元数据失败: {strategy}")
+                logger.error("创建分发元数据失败: %s", strategy)
                 return False
             
-            logger.info(f"✓ 分发包创建完成: {strategy}")
+            # 最后写入指纹，保证只有完整生成的分发包才会被跳过；
+            # 强制重建时使用本次复制层级文件时记录的源文件状态，无需再次遍历源码
+            if fingerprint is None:
+                fingerprint = self._compute_distribution_fingerprint(
+                    strategy, layers_to_include, self._layer_source_state)
+            self._write_fingerprint(dist_dir, fingerprint)
+            
+            logger.info("✓ 分发包创建完成: %s", strategy)
             return True
             
         except Exception as e:
-            logger.error(f"创建分发包失败 {strategy}: {e}")
+            logger.error("创建分发包失败 %s: %s", strategy, e)
+            return False
+    
+    def _compute_distribution_fingerprint(self, strategy: str, layers: List[str],
+                                          source_state: Optional[Dict[str, List[tuple]]] = None) -> str:
+        """
+        计算分发包指纹
+        
+        Args:
+            strategy: 分发策略
+            layers: 包含的层级列表
+            source_state: 已记录的各层级源文件状态，未提供（或缺少某层级）时遍历源文件
+            
+        Returns:
+            str: 分发包指纹
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((strategy, tuple(layers))).encode('utf-8'))
+        
+        # 纳入各层级版本及源文件状态，任一源文件变更都会使指纹失效
+        for name in layers:
+            digest.update(repr((name, self.layers[name]["version"])).encode('utf-8'))
+            if source_state is not None and name in source_state:
+                entries = source_state[name]
+            else:
+                entries = [self._source_entry(path) for path in self._iter_layer_source_files(name)]
+            digest.update(repr(sorted(entries)).encode('utf-8'))
+        
+        return digest.hexdigest()
+    
+    def _source_entry(self, source_path: Path) -> tuple:
+        """
+        获取参与指纹计算的源文件状态
+        
+        Args:
+            source_path: 源文件路径
+            
+        Returns:
+            tuple: (相对路径, mtime_ns, 大小)
+        """
+        stat = source_path.stat()
+        return str(source_path.relative_to(self.project_root)), stat.st_mtime_ns, stat.st_size
+    
+    def _write_fingerprint(self, dist_dir: Path, fingerprint: str):
+        """
+        写入分发包指纹及输出文件清单
+        
+        Args:
+            dist_dir: 分发目录
+            fingerprint: 分发包指纹
+        """
+        fingerprint_file = dist_dir / ".fingerprint"
+        outputs = sorted(path.relative_to(dist_dir).as_posix()
+                         for path in dist_dir.rglob("*") if path.is_file() and path != fingerprint_file)
+        fingerprint_file.write_text("\n".join([fingerprint, *outputs]), encoding='utf-8')
+    
+    def _is_distribution_current(self, dist_dir: Path, fingerprint: str) -> bool:
+        """
+        检查分发包是否已是最新：指纹一致且清单中的输出文件都还存在
+        
+        Args:
+            dist_dir: 分发目录
+            fingerprint: 当前的分发包指纹
+            
+        Returns:
+            bool: 是否可以跳过重新生成
+        """
+        try:
+            lines = (dist_dir / ".fingerprint").read_text(encoding='utf-8').split("\n")
+        except OSError:
             return False
+        if lines[0] != fingerprint:
+            return False
+        return all((dist_dir / rel_path).is_file() for rel_path in lines[1:])
+    
+    def _iter_layer_source_files(self, layer_name: str):
+        """
+        枚举层级包含的源文件
+        
+        Args:
+            layer_name: 层级名称
+            
+        Yields:
+            Path: 匹配包含模式且未被排除的源文件路径
+        """
+        layer_config = self.layers[layer_name]
+        includes = layer_config["includes"]
+        excludes = layer_config["excludes"]
+        
+        for include_pattern in includes:
+            # 处理排除模式
+            if include_pattern.startswith("!"):
+                continue
+            
+            # 查找匹配的文件
+            if "**" in include_pattern:
+                # 递归模式
+                pattern_parts = include_pattern.split("/**")
+                base_pattern = pattern_parts[0]
+                
+                for source_path in self.project_root.glob(base_pattern):
+                    if source_path.is_dir():
+                        for file_path in source_path.rglob("*"):
+                            if file_path.is_file() and not self._should_exclude(file_path, excludes):
+                                yield file_path
+            else:
+                # 简单模式
+                for source_path in self.project_root.glob(include_pattern):
+                    if source_path.is_file() and not self._should_exclude(source_path, excludes):
+                        yield source_path
     
     def _copy_layer_files(self, layer_name: str, layer_dir: Path) -> bool:
         """
@@ -284,47 +606,24 @@ class LayeredPackageManager:
             bool: 复制是否成功
         """
         try:
-            layer_config = self.layers[layer_name]
-            includes = layer_config["includes"]
-            excludes = layer_config["excludes"]
-            
             copied_files = 0
             
-            for include_pattern in includes:
-                # 处理排除模式
-                if include_pattern.startswith("!"):
-                    continue
-                
-                # 查找匹配的文件
-                if "**" in include_pattern:
-                    # 递归模式
-                    pattern_parts = include_pattern.split("/**")
-                    base_pattern = pattern_parts[0]
-                    
-                    for source_path in self.project_root.glob(base_pattern):
-                        if source_path.is_dir():
-                            for file_path in source_path.rglob("*"):
-                                if file_path.is_file() and not self._should_exclude(file_path, excludes):
-                                    rel_path = file_path.relative_to(self.project_root)
-                                    dest_path = layer_dir / rel_path
-                                    dest_path.parent.mkdir(parents=True, exist_ok=True)
-                                    shutil.copy2(file_path, dest_path)
-                                    copied_files += 1
-                else:
-                    # 简单模式
-                    for source_path in self.project_root.glob(include_pattern):
-                        if source_path.is_file() and not self._should_exclude(source_path, excludes):
-                            rel_path = source_path.relative_to(self.project_root)
-                            dest_path = layer_dir / rel_path
-                            dest_path.parent.mkdir(parents=True, exist_ok=True)
-                            shutil.copy2(source_path, dest_path)
-                            copied_files += 1
-            
-            logger.debug(f"层级 {layer_name} 复制了 {copied_files} 个文件")
+            source_state = []
+            for source_path in self._iter_layer_source_files(layer_name):
+                # 复制前记录源文件状态，强制重建时直接用于计算分发包指纹
+                source_state.append(self._source_entry(source_path))
+                rel_path = source_path.relative_to(self.project_root)
+                dest_path = layer_dir / rel_path
+                dest_path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(source_path, dest_path)
+                copied_files += 1
+            
+            self._layer_source_state[layer_name] = source_state
+            logger.debug("层级 %s 复制了 %s 个文件", layer_name, copied_files)
             return copied_files > 0
             
         except Exception as e:
-            logger.error(f"复制层级文件失败 {layer_name}: {e}")
+            logger.error("复制层级文件失败 %s: %s", layer_name, e)
             return False
     
     def _should_exclude(self, file_path: Path, excludes: List[str]) -> bool:
@@ -374,7 +673,7 @@ class LayeredPackageManager:
             layer_config = self.layers[layer_name]
             protection_level = layer_config["protection_level"]
             
-            logger.debug(f"应用保护级别 {protection_level} 到层级 {layer_name}")
+            logger.debug("应用保护级别 %s 到层级 %s", protection_level, layer_name)
             
             if protection_level == "source":
                 # 源码保护：不做任何处理
@@ -393,11 +692,11 @@ class LayeredPackageManager:
                 return self._apply_encryption(layer_dir)
             
             else:
-                logger.warning(f"未知的保护级别: {protection_level}")
+                logger.warning("未知的保护级别: %s", protection_level)
                 return True
             
         except Exception as e:
-            logger.error(f"应用层级保护失败 {layer_name}: {e}")
+            logger.error("应用层级保护失败 %s: %s", layer_name, e)
             return False
     
     def _compile_to_bytecode(self, layer_dir: Path) -> bool:
@@ -427,13 +726,13 @@ class LayeredPackageManager:
                     compiled_count += 1
                     
                 except Exception as e:
-                    logger.warning(f"编译文件失败 {py_file}: {e}")
+                    logger.warning("编译文件失败 %s: %s", py_file, e)
             
-            logger.debug(f"编译了 {compiled_count} 个Python文件")
+            logger.debug("编译了 %s 个Python文件", compiled_count)
             return True
             
         except Exception as e:
-            logger.error(f"字节码编译失败: {e}")
+            logger.error("字节码编译失败: %s", e)
             return False
     
     def _apply_obfuscation(self, layer_dir: Path) -> bool:
@@ -464,13 +763,13 @@ class LayeredPackageManager:
                     obfuscated_count += 1
                     
                 except Exception as e:
-                    logger.warning(f"混淆文件失败 {py_file}: {e}")
+                    logger.warning("混淆文件失败 %s: %s", py_file, e)
             
-            logger.debug(f"混淆了 {obfuscated_count} 个Python文件")
+            logger.debug("混淆了 %s 个Python文件", obfuscated_count)
             return True
             
         except Exception as e:
-            logger.error(f"代码混淆失败: {e}")
+            logger.error("代码混淆失败: %s", e)
             return False
     
     def _obfuscate_content(self, content: str) -> str:
@@ -534,13 +833,13 @@ class LayeredPackageManager:
                         encrypted_count += 1
                         
                     except Exception as e:
-                        logger.warning(f"加密文件失败 {file_path}: {e}")
+                        logger.warning("加密文件失败 %s: %s", file_path, e)
             
-            logger.debug(f"加密了 {encrypted_count} 个配置文件")
+            logger.debug("加密了 %s 个配置文件", encrypted_count)
             return True
             
         except Exception as e:
-            logger.error(f"文件加密失败: {e}")
+            logger.error("文件加密失败: %s", e)
             return False
     
     def _create_layer_package_config(self, layer_name: str, layer_dir: Path) -> bool:
@@ -578,11 +877,11 @@ class LayeredPackageManager:
                 with open(manifest_file, 'w', encoding='utf-8') as f:
                     f.write(manifest_content)
             
-            logger.debug(f"层级包配置创建完成: {layer_name}")
+            logger.debug("层级包配置创建完成: %s", layer_name)
             return True
             
         except Exception as e:
-            logger.error(f"创建层级包配置失败 {layer_name}: {e}")
+            logger.error("创建层级包配置失败 %s: %s", layer_name, e)
             return False
     
     def _generate_setup_py(self, layer_config: Dict[str, Any]) -> str:
@@ -747,11 +1046,11 @@ setup(
             with open(readme_file, 'w', encoding='utf-8') as f:
                 f.write(readme_content)
             
-            logger.debug(f"层级元数据创建完成: {layer_name}")
+            logger.debug("层级元数据创建完成: %s", layer_name)
             return True
             
         except Exception as e:
-            logger.error(f"创建层级元数据失败 {layer_name}: {e}")
+            logger.error("创建层级元数据失败 %s: %s", layer_name, e)
             return False
     
     def _generate_layer_readme(self, layer_config: Dict[str, Any]) -> str:
@@ -874,7 +1173,7 @@ MIT License
             bool: 组装是否成功
         """
         try:
-            logger.debug(f"组装分发包: {strategy}")
+            logger.debug("组装分发包: %s", strategy)
             
             # 复制各个层级到分发目录
             for layer_name in layers:
@@ -883,14 +1182,14 @@ MIT License
                 
                 if layer_source.exists():
                     shutil.copytree(layer_source, layer_dest, dirs_exist_ok=True)
-                    logger.debug(f"已复制层级: {layer_name}")
+                    logger.debug("已复制层级: %s", layer_name)
                 else:
-                    logger.warning(f"层级目录不存在: {layer_source}")
+                    logger.warning("层级目录不存在: %s", layer_source)
             
             return True
             
         except Exception as e:
-            logger.error(f"组装分发包失败 {strategy}: {e}")
+            logger.error("组装分发包失败 %s: %s", strategy, e)
             return False
     
     def _create_installation_scripts(self, strategy: str, dist_dir: Path) -> bool:
@@ -905,171 +1204,49 @@ MIT License
             bool: 创建是否成功
         """
         try:
-            # 创建安装脚本
-            install_script = self._generate_install_script(strategy)
-            install_file = dist_dir / "install.py"
-            
-            with open(install_file, 'w', encoding='utf-8') as f:
-                f.write(install_script)
-            
-            # 创建批处理安装脚本
-            batch_script = self._generate_batch_install_script(strategy)
-            batch_file = dist_dir / "install.bat"
+            scripts = self._build_script_bundle(strategy, self.distribution_strategies[strategy])
             
-            with open(batch_file, 'w', encoding='utf-8') as f:
-                f.write(batch_script)
+            # 创建Python、批处理和Shell安装脚本
+            for suffix, content in scripts.items():
+                with open(dist_dir / f"install.{suffix}", 'w', encoding='utf-8') as f:
+                    f.write(content)
             
-            # 创建Shell安装脚本
-            shell_script = self._generate_shell_install_script(strategy)
             shell_file = dist_dir / "install.sh"
             
-            with open(shell_file, 'w', encoding='utf-8') as f:
-                f.write(shell_script)
-            
             # 设置执行权限
             try:
                 shell_file.chmod(0o755)
             except Exception:
                 pass  # Windows上可能不支持
             
-            logger.debug(f"安装脚本创建完成: {strategy}")
+            logger.debug("安装脚本创建完成: %s", strategy)
             return True
             
         except Exception as e:
-            logger.error(f"创建安装脚本失败 {strategy}: {e}")
+            logger.error("创建安装脚本失败 %s: %s", strategy, e)
             return False
     
-    def _generate_install_script(self, strategy: str) -> str:
-        """
-        生成Python安装脚本
-        
-        Args:
-            strategy: 分发策略
-            
-        Returns:
-            str: 安装脚本内容
-        """
-        layers = self.distribution_strategies[strategy]
-        
-        script_template = f'''
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-CHS-Core {strategy.title()} 分发包安装脚本
-
-此脚本自动安装 CHS-Core {strategy} 分发包中的所有组件。
-"""
-
-import os
-import sys
-import subprocess
-from pathlib import Path
-
-def install_layer(layer_name):
-    """安装指定层级"""
-    layer_dir = Path(__file__).parent / layer_name
-    
-    if not layer_dir.exists():
-        print(f"错误: 层级目录不存在: {{layer_dir}}")
-        return False
-    
-    setup_file = layer_dir / "setup.py"
-    if not setup_file.exists():
-        print(f"错误: setup.py不存在: {{setup_file}}")
-        return False
-    
-    print(f"安装层级: {{layer_name}}")
-    
-    try:
-        # 运行pip install
-        cmd = [sys.executable, "-m", "pip", "install", "-e", str(layer_dir)]
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        print(f"✓ {{layer_name}} 安装成功")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {{layer_name}} 安装失败: {{e}}")
-        print(f"错误输出: {{e.stderr}}")
-        return False
-
-def main():
-    """主安装函数"""
-    print("🚀 开始安装 CHS-Core {strategy.title()} 分发包...")
-    
-    layers_to_install = {layers}
-    
-    success_count = 0
-    total_count = len(layers_to_install)
-    
-    for layer_name in layers_to_install:
-        if install_layer(layer_name):
-            success_count += 1
-        else:
-            print(f"警告: 层级安装失败: {{layer_name}}")
-    
-    print(f"\n安装完成: {{success_count}}/{{total_count}} 个层级安装成功")
-    
-    if success_count == total_count:
-        print("🎉 所有组件安装成功！")
-        return 0
-    else:
-        print("⚠️ 部分组件安装失败，请检查错误信息")
-        return 1
-
-if __name__ == "__main__":
-    sys.exit(main())
-'''
-        return script_template.strip()
-    
-    def _generate_batch_install_script(self, strategy: str) -> str:
+    def _build_script_bundle(self, strategy: str, layers: List[str]) -> Dict[str, str]:
         """
-        生成批处理安装脚本
-        
-        Args:
-            strategy: 分发策略
-            
-        Returns:
-            str: 批处理脚本内容
-        """
-        script_template = f'''
-@echo off
-echo 安装 CHS-Core {strategy.title()} 分发包...
-
-python install.py
-
-if %ERRORLEVEL% EQU 0 (
-    echo 安装成功！
-    pause
-) else (
-    echo 安装失败！
-    pause
-)
-'''
-        return script_template.strip()
-    
-    def _generate_shell_install_script(self, strategy: str) -> str:
-        """
-        生成Shell安装脚本
+        一次性生成全部安装脚本
         
         Args:
             strategy: 分发策略
+            layers: 包含的层级列表
             
         Returns:
-            str: Shell脚本内容
+            Dict[str, str]: 脚本类型(py/bat/sh)到脚本内容的映射
         """
-        script_template = f'''
-#!/bin/bash
-echo "安装 CHS-Core {strategy.title()} 分发包..."
-
-python3 install.py
-
-if [ $? -eq 0 ]; then
-    echo "安装成功！"
-else
-    echo "安装失败！"
-    exit 1
-fi
-'''
-        return script_template.strip()
+        fields = {
+            "strategy": strategy,
+            "title": strategy.title(),
+            "layers": repr(layers),
+        }
+        return {
+            "py": _INSTALL_PY_TEMPLATE.format(**fields),
+            "bat": _INSTALL_BAT_TEMPLATE.format(**fields),
+            "sh": _INSTALL_SH_TEMPLATE.format(**fields),
+        }
     
     def _create_distribution_metadata(self, strategy: str, dist_dir: Path, layers: List[str]) -> bool:
         """
@@ -1114,11 +1291,11 @@ fi
             with open(readme_file, 'w', encoding='utf-8') as f:
                 f.write(readme_content)
             
-            logger.debug(f"分发元数据创建完成: {strategy}")
+            logger.debug("分发元数据创建完成: %s", strategy)
             return True
             
         except Exception as e:
-            logger.error(f"创建分发元数据失败 {strategy}: {e}")
+            logger.error("创建分发元数据失败 %s: %s", strategy, e)
             return False
     
     def _generate_distribution_readme(self, strategy: str, layers: List[str]) -> str:
@@ -1132,81 +1309,16 @@ fi
         Returns:
             str: README内容
         """
-        readme_template = f'''
-# CHS-Core {strategy.title()} 分发包
-
-这是 CHS-Core 的 {strategy} 分发包，包含以下组件：
-
-{self._format_layers_markdown(layers)}
-
-## 快速安装
-
-### 自动安装（推荐）
-
-```bash
-# Windows
-install.bat
-
-# Linux/macOS
-./install.sh
-
-# 或者直接使用Python
-python install.py
-```
-
-### 手动安装
-
-按以下顺序安装各个组件：
-
-{self._format_manual_install_steps(layers)}
-
-## 组件说明
-
-{self._format_component_descriptions(layers)}
-
-## 系统要求
-
-- Python 3.8+
-- pip
-
-## 验证安装
-
-```python
-# 验证API层
-import chs_core_api
-print("API层安装成功")
-
-# 验证其他组件
-# TODO: 添加具体的验证代码
-```
-
-## 故障排除
-
-### 常见问题
-
-1. **权限错误**: 使用 `sudo` 或管理员权限运行安装脚本
-2. **依赖冲突**: 建议使用虚拟环境安装
-3. **网络问题**: 检查网络连接和pip源配置
-
-### 获取帮助
-
-如果遇到问题，请：
-
-1. 检查 `distribution_info.json` 中的详细信息
-2. 查看安装日志
-3. 联系 CHS-Core 团队
-
-## 许可证
-
-MIT License
-
-## 版本信息
-
-- 分发策略: {strategy}
-- 创建时间: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-- 包含层级: {len(layers)} 个
-'''
-        return readme_template.strip()
+        subs = {
+            "strategy": strategy,
+            "strategy_title": strategy.title(),
+            "layer_list": self._format_layers_markdown(layers),
+            "manual_steps": self._format_manual_install_steps(layers),
+            "component_descriptions": self._format_component_descriptions(layers),
+            "layer_count": len(layers),
+            "now": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        return _README_TEMPLATE.safe_substitute(subs)
     
     def _format_layers_markdown(self, layers: List[str]) -> str:
         """
@@ -1370,9 +1482,9 @@ def main():
         if args.layer:
             success = manager.create_layer(args.layer, args.force)
             if success:
-                logger.info(f"✓ 层级创建成功: {args.layer}")
+                logger.info("✓ 层级创建成功: %s", args.layer)
             else:
-                logger.error(f"❌ 层级创建失败: {args.layer}")
+                logger.error("❌ 层级创建失败: %s", args.layer)
                 sys.exit(1)
             return
         
@@ -1380,9 +1492,9 @@ def main():
         if args.distribution:
             success = manager.create_distribution(args.distribution, args.force)
             if success:
-                logger.info(f"✓ 分发包创建成功: {args.distribution}")
+                logger.info("✓ 分发包创建成功: %s", args.distribution)
             else:
-                logger.error(f"❌ 分发包创建失败: {args.distribution}")
+                logger.error("❌ 分发包创建失败: %s", args.distribution)
                 sys.exit(1)
             return
         
@@ -1398,7 +1510,7 @@ def main():
         logger.info("用户中断操作")
         sys.exit(1)
     except Exception as e:
-        logger.error(f"操作失败: {e}")
+        logger.error("操作失败: %s", e)
         sys.exit(1)
 
 
@@ -18,28 +18,632 @@ CHS-Core 代码保护脚本
 import os
 import sys
 import shutil
-import py_compile
-import compileall
+import re
+import fnmatch
+import ast
+import hashlib
+import marshal
+import struct
+import importlib.util
 import argparse
 import logging
+import atexit
+import queue
+import multiprocessing
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Set, Callable
 import zipfile
-import tempfile
 import json
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 作为scripts包的模块导入时使用相对导入，直接作为脚本运行时从脚本目录导入
+try:
+    from .file_copy import fast_copy, link_or_copy
+except ImportError:
+    from file_copy import fast_copy, link_or_copy
+
+# 日志：日志记录经队列交给后台线程写入文件和控制台，避免日志I/O阻塞保护流程。
+# 导入模块时不做任何配置，由main()或首个CodeProtector按输出目录初始化
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_FILE_NAME = 'protection.log'
+
+_log_listener: Optional[QueueListener] = None
+_log_file: Optional[Path] = None
+
+
+def _create_log_handlers(log_file: Optional[Path]) -> List[logging.Handler]:
+    """
+    创建实际输出日志的处理器
+    
+    Args:
+        log_file: 日志文件路径，为None时只输出到控制台
+    
+    Returns:
+        List[logging.Handler]: 文件与控制台处理器
+    """
+    handlers: List[logging.Handler] = [logging.StreamHandler(sys.stdout)]
+    if log_file is not None:
+        handlers.insert(0, logging.FileHandler(log_file, encoding='utf-8'))
+    formatter = logging.Formatter(LOG_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def setup_logging(log_dir) -> None:
+    """
+    初始化日志输出（只执行一次）
+    
+    日志文件写入log_dir；宿主程序已配置根日志时沿用其配置，不再添加处理器。
+    
+    Args:
+        log_dir: 日志文件所在目录（通常为输出目录）
+    """
+    global _log_listener, _log_file
+    root = logging.getLogger()
+    if _log_listener is not None or root.handlers:
+        return
+    
+    log_dir = Path(log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    _log_file = log_dir / LOG_FILE_NAME
+    
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    _log_listener = QueueListener(log_queue, *_create_log_handlers(_log_file))
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))  # 完整格式由监听端处理器负责
+    root.addHandler(queue_handler)
+    root.setLevel(logging.INFO)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+
+def _init_worker_logging(log_file: Optional[Path]):
+    """
+    进程池子进程的日志初始化
+    
+    子进程中没有队列监听线程，因此直接写入处理器。
+    
+    Args:
+        log_file: 主进程使用的日志文件路径
+    """
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    for handler in _create_log_handlers(log_file):
+        root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
 
-# 设置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('protection.log', encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger(__name__)
 
+# 简单混淆使用的行匹配模式
+_COMMENT_LINE_RE = re.compile(r'^[^\S\n]*#(?!.*(?:"""|\'\'\')).*(?:\n|$)', re.MULTILINE)
+_BLANK_LINE_RE = re.compile(r'^[^\S\n]*(?:\n|$)', re.MULTILINE)
+_TOP_LEVEL_LINE_RE = re.compile(r'^(?!    )(?=.)', re.MULTILINE)
+
+# 可能动态访问局部变量的内置函数，包含这些调用的函数不做局部变量重命名
+_DYNAMIC_SCOPE_CALLS = frozenset({"locals", "vars", "eval", "exec", "dir", "globals"})
+
+
+class _DocstringRemover(ast.NodeTransformer):
+    """移除模块、类和函数的文档字符串"""
+    
+    def _strip(self, node):
+        self.generic_visit(node)
+        body = node.body
+        if (body and isinstance(body[0], ast.Expr) and
+                isinstance(body[0].value, ast.Constant) and isinstance(body[0].value.value, str)):
+            node.body = body[1:] or [ast.Pass()]
+        return node
+    
+    visit_Module = _strip
+    visit_ClassDef = _strip
+    visit_FunctionDef = _strip
+    visit_AsyncFunctionDef = _strip
+
+
+class _LocalRenamer(ast.NodeTransformer):
+    """
+    将函数局部变量重命名为基于哈希的无意义名称
+    
+    只处理不含嵌套作用域、global/nonlocal声明和动态作用域访问的函数，
+    参数名保持不变以兼容关键字调用。
+    """
+    
+    def __init__(self):
+        self.salt = ""
+    
+    def _new_name(self, name: str) -> str:
+        digest = hashlib.blake2b(f"{self.salt}:{name}".encode('utf-8'), digest_size=4).hexdigest()
+        return f"_0x{digest}"
+    
+    def _rename_locals(self, node):
+        self.generic_visit(node)
+        
+        for child in ast.walk(ast.Module(body=node.body, type_ignores=[])):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef,
+                                  ast.Global, ast.Nonlocal)):
+                return node
+            if type(child).__name__ == "Match":
+                return node
+            if (isinstance(child, ast.Call) and isinstance(child.func, ast.Name) and
+                    child.func.id in _DYNAMIC_SCOPE_CALLS):
+                return node
+        
+        args = node.args
+        reserved = {a.arg for a in args.posonlyargs + args.args + args.kwonlyargs}
+        reserved.update(a.arg for a in (args.vararg, args.kwarg) if a is not None)
+        
+        local_names = set()
+        comprehension_nodes = set()
+        for child in ast.walk(ast.Module(body=node.body, type_ignores=[])):
+            if isinstance(child, (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+                comprehension_nodes.update(id(n) for n in ast.walk(child))
+            elif isinstance(child, (ast.Import, ast.ImportFrom)):
+                reserved.update((alias.asname or alias.name).split('.')[0] for alias in child.names)
+            elif isinstance(child, ast.ExceptHandler) and child.name:
+                reserved.add(child.name)
+        
+        for child in ast.walk(ast.Module(body=node.body, type_ignores=[])):
+            if (isinstance(child, ast.Name) and not isinstance(child.ctx, ast.Load) and
+                    id(child) not in comprehension_nodes):
+                local_names.add(child.id)
+        
+        mapping = {name: self._new_name(name) for name in local_names - reserved}
+        if mapping:
+            for child in ast.walk(ast.Module(body=node.body, type_ignores=[])):
+                if isinstance(child, ast.Name) and child.id in mapping:
+                    child.id = mapping[child.id]
+        
+        return node
+    
+    visit_FunctionDef = _rename_locals
+    visit_AsyncFunctionDef = _rename_locals
+
+
+class _DeadCodeInserter(ast.NodeTransformer):
+    """在return语句之后插入不可达的死代码块"""
+    
+    def generic_visit(self, node):
+        super().generic_visit(node)
+        for field in ("body", "orelse", "finalbody"):
+            stmts = getattr(node, field, None)
+            if not isinstance(stmts, list) or not any(isinstance(s, ast.Return) for s in stmts):
+                continue
+            new_stmts = []
+            for stmt in stmts:
+                new_stmts.append(stmt)
+                if isinstance(stmt, ast.Return):
+                    new_stmts.append(ast.If(test=ast.Constant(value=False), body=[ast.Pass()], orelse=[]))
+            setattr(node, field, new_stmts)
+        return node
+
+
+class _AstObfuscator:
+    """
+    基于AST的代码混淆器
+    
+    每个文件只解析和反解析一次，依次应用文档字符串移除、局部变量重命名和死代码插入。
+    """
+    
+    def __init__(self):
+        self._renamer = _LocalRenamer()
+        self._transformers = (_DocstringRemover(), self._renamer, _DeadCodeInserter())
+    
+    def obfuscate(self, source_code: str, salt: str, timestamp: str) -> str:
+        """
+        混淆源代码
+        
+        Args:
+            source_code: 源代码
+            salt: 生成重命名哈希使用的盐值（通常为文件相对路径）
+            timestamp: 混淆标记中的时间戳
+            
+        Returns:
+            str: 混淆后的代码
+        """
+        return self.obfuscate_tree(ast.parse(source_code), salt, timestamp)
+    
+    def obfuscate_tree(self, tree: ast.Module, salt: str, timestamp: str) -> str:
+        """
+        混淆已解析的语法树（会原地修改语法树）
+        
+        Args:
+            tree: 模块语法树
+            salt: 生成重命名哈希使用的盐值（通常为文件相对路径）
+            timestamp: 混淆标记中的时间戳
+            
+        Returns:
+            str: 混淆后的代码
+        """
+        self._renamer.salt = salt
+        for transformer in self._transformers:
+            tree = transformer.visit(tree)
+        ast.fix_missing_locations(tree)
+        return f"# Obfuscated at {timestamp}\n{ast.unparse(tree)}\n"
+
+
+def _simple_obfuscate(source_code: str, timestamp: str) -> str:
+    """
+    简单的代码混淆
+    
+    Args:
+        source_code: 源代码
+        timestamp: 混淆标记中的时间戳
+        
+    Returns:
+        str: 混淆后的代码
+    """
+    # 这是一个简化的混淆示例
+    # 实际项目中应该使用专业的混淆工具如 pyarmor
+    
+    # 移除注释行（保留含文档字符串引号的行）和空行
+    code = _BLANK_LINE_RE.sub('', _COMMENT_LINE_RE.sub('', source_code))
+    
+    # 在每个非缩进行前添加混淆标记
+    marker = f"# Obfuscated at {timestamp}\n"
+    return _TOP_LEVEL_LINE_RE.sub(lambda _: marker, code)
+
+
+# 每个进程复用一个AST混淆器实例
+_AST_OBFUSCATOR = _AstObfuscator()
+
+
+def _obfuscate_source(source_code: str, rel_path: str, mode: str, timestamp: str) -> str:
+    """
+    按指定混淆方式混淆源代码
+    
+    ast模式需要Python 3.9+（ast.unparse），不可用或源码无法解析时退回简单混淆。
+    
+    Args:
+        source_code: 源代码
+        rel_path: 相对路径（POSIX格式）
+        mode: 混淆方式，ast 或 simple
+        timestamp: 混淆标记中的时间戳（每次保护运行只生成一次）
+        
+    Returns:
+        str: 混淆后的代码
+    """
+    if mode == "ast" and hasattr(ast, "unparse"):
+        try:
+            return _AST_OBFUSCATOR.obfuscate(source_code, rel_path, timestamp)
+        except SyntaxError as e:
+            logger.warning(f"AST解析失败，使用简单混淆 {rel_path}: {e}")
+    
+    return _simple_obfuscate(source_code, timestamp)
+
+
+# 进程池任务结果: (错误信息, 需写入归档的数据)
+JobResult = Tuple[Optional[str], Optional[bytes]]
+
+# 源代码目录遍历结果: (文件路径, 相对路径, 是否为Python文件, stat结果)
+SourceEntry = Tuple[Path, Path, bool, os.stat_result]
+
+
+# .pyc头部标志：基于源码哈希校验（PEP 552 checked-hash模式）
+PYC_CHECKED_HASH_FLAGS = 0b11
+_PYC_HEADER_PREFIX = importlib.util.MAGIC_NUMBER + struct.pack('<I', PYC_CHECKED_HASH_FLAGS)
+# .pyc头部长度：魔数(4) + 标志(4) + 源码哈希(8)
+_PYC_HEADER_SIZE = len(_PYC_HEADER_PREFIX) + 8
+
+# 输出目录中的配置戳文件，记录生成输出时影响产物内容的配置项
+PROTECTION_STAMP_FILE = ".protection_stamp"
+_STAMP_CONFIG_KEYS = {
+    "bytecode": ("optimize",),
+    "obfuscation": ("obfuscation_mode",),
+}
+
+
+def _build_pyc(source: bytes, filename: str, optimize: int = -1, tree: Optional[ast.Module] = None) -> bytes:
+    """
+    将内存中的源码编译为.pyc文件内容，无需重新读取源文件
+    
+    头部写入源码哈希（checked-hash模式），下游在存在源码时可据此检测源码变化。
+    
+    Args:
+        source: 源码字节
+        filename: 写入代码对象的源文件名
+        optimize: 优化级别，2表示移除assert和文档字符串
+        tree: 已解析的语法树，提供时直接编译语法树，不再重复解析源码
+        
+    Returns:
+        bytes: .pyc文件内容
+    """
+    code = compile(source if tree is None else tree, filename, 'exec', dont_inherit=True, optimize=optimize)
+    data = bytearray(_PYC_HEADER_PREFIX)
+    data += importlib.util.source_hash(source)
+    data += marshal.dumps(code)
+    return bytes(data)
+
+
+def _emit_output(data: bytes, dest_file: Optional[str]) -> Optional[bytes]:
+    """
+    输出任务结果：指定了目标文件时直接写入，否则返回数据交由主进程写入归档
+    
+    Args:
+        data: 输出内容
+        dest_file: 目标文件路径，归档模式下为None
+        
+    Returns:
+        Optional[bytes]: 归档模式下返回数据，否则返回None
+    """
+    if dest_file is None:
+        return data
+    with open(dest_file, 'wb') as f:
+        f.write(data)
+    return None
+
+
+def _compile_source_job(args: Tuple[bytes, Optional[str], str, int]) -> JobResult:
+    """
+    编译已读取的源码（进程池任务）
+    
+    Args:
+        args: (源码字节, 字节码文件路径, 源文件名, 优化级别)
+        
+    Returns:
+        JobResult: (失败时的错误信息, 归档模式下的.pyc内容)
+    """
+    source, pyc_file, filename, optimize = args
+    try:
+        return None, _emit_output(_build_pyc(source, filename, optimize), pyc_file)
+    except Exception as e:
+        return str(e), None
+
+
+def _compile_job(args: Tuple[str, Optional[str], int]) -> JobResult:
+    """
+    编译单个Python文件（进程池任务）
+    
+    Args:
+        args: (源文件路径, 字节码文件路径, 优化级别)
+        
+    Returns:
+        JobResult: (失败时的错误信息, 归档模式下的.pyc内容)
+    """
+    py_file, pyc_file, optimize = args
+    try:
+        with open(py_file, 'rb') as f:
+            source = f.read()
+    except Exception as e:
+        return str(e), None
+    return _compile_source_job((source, pyc_file, py_file, optimize))
+
+
+def _obfuscate_source_job(args: Tuple[bytes, Optional[str], str, str, str]) -> JobResult:
+    """
+    混淆已读取的源码（进程池任务）
+    
+    Args:
+        args: (源码字节, 目标文件路径, 相对路径, 混淆方式, 时间戳)
+        
+    Returns:
+        JobResult: (失败时的错误信息, 归档模式下的混淆代码)
+    """
+    source, dest_file, rel_path, mode, timestamp = args
+    try:
+        obfuscated_code = _obfuscate_source(importlib.util.decode_source(source), rel_path, mode, timestamp)
+        return None, _emit_output(obfuscated_code.encode('utf-8'), dest_file)
+    except Exception as e:
+        return str(e), None
+
+
+def _obfuscate_job(args: Tuple[str, Optional[str], str, str, str]) -> JobResult:
+    """
+    混淆单个Python文件（进程池任务）
+    
+    Args:
+        args: (源文件路径, 目标文件路径, 相对路径, 混淆方式, 时间戳)
+        
+    Returns:
+        JobResult: (失败时的错误信息, 归档模式下的混淆代码)
+    """
+    py_file, dest_file, rel_path, mode, timestamp = args
+    try:
+        with open(py_file, 'rb') as f:
+            source = f.read()
+    except Exception as e:
+        return str(e), None
+    return _obfuscate_source_job((source, dest_file, rel_path, mode, timestamp))
+
+
+def _process_one(args: Tuple[bytes, str, str, int, Optional[str], Optional[str], str, str]
+                 ) -> Tuple[JobResult, JobResult]:
+    """
+    对同一份源码同时完成字节码编译和代码混淆（进程池任务）
+    
+    源码只解析一次：语法树先编译为字节码，再交给AST混淆器原地变换。
+    
+    Args:
+        args: (源码字节, 相对路径, 源文件名, 优化级别,
+               字节码文件路径, 混淆文件路径, 混淆方式, 时间戳)
+        
+    Returns:
+        Tuple[JobResult, JobResult]: (编译结果, 混淆结果)
+    """
+    source, rel_path, filename, optimize, pyc_file, obf_file, mode, timestamp = args
+    
+    tree = None
+    try:
+        tree = ast.parse(source, filename)
+        compile_result = None, _emit_output(_build_pyc(source, filename, optimize, tree), pyc_file)
+    except Exception as e:
+        compile_result = str(e), None
+    
+    try:
+        if tree is not None and mode == "ast" and hasattr(ast, "unparse"):
+            obfuscated_code = _AST_OBFUSCATOR.obfuscate_tree(tree, rel_path, timestamp)
+        else:
+            obfuscated_code = _obfuscate_source(importlib.util.decode_source(source), rel_path, mode, timestamp)
+        obfuscate_result = None, _emit_output(obfuscated_code.encode('utf-8'), obf_file)
+    except Exception as e:
+        obfuscate_result = str(e), None
+    
+    return compile_result, obfuscate_result
+
+
+# 少于该数量的任务直接串行执行，避免进程池启动开销
+PARALLEL_MIN_JOBS = 8
+
+# 进程池启动方式：主进程中有日志监听等线程，不直接fork；
+# POSIX上由单线程的forkserver进程派生子进程，其他平台使用默认的spawn
+_POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None)
+
+
+def _run_parallel(func, jobs: List[Any], chunksize: int = 1) -> List[Any]:
+    """
+    使用进程池并行执行任务，任务较少或进程池不可用时串行执行
+    
+    Args:
+        func: 模块级任务函数（需可pickle）
+        jobs: 任务参数列表
+        chunksize: 每次分发给子进程的任务数
+        
+    Returns:
+        List[Any]: 与jobs一一对应的结果列表
+    """
+    workers = os.cpu_count() or 1
+    if workers > 1 and len(jobs) >= PARALLEL_MIN_JOBS:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_POOL_CONTEXT,
+                                     initializer=_init_worker_logging, initargs=(_log_file,)) as executor:
+                return list(executor.map(func, jobs, chunksize=chunksize))
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning(f"进程池不可用，改为串行执行: {e}")
+    
+    return [func(job) for job in jobs]
+
+
+# 归档输出模式下的zip文件名
+ARCHIVE_NAME = "protected.zip"
+
+
+class _ProtectedOutput:
+    """
+    保护结果的Python模块输出目标
+    
+    默认写入目录树；归档模式下所有Python模块（.pyc、混淆代码和保留的源文件）及数据文件
+    写入一个不压缩的zip文件，可直接加入sys.path由zipimport导入。归档中为每个目录写入目录条目，
+    没有__init__.py的命名空间包也能被导入。
+    """
+    
+    def __init__(self, root: Path, ensure_dir: Callable[[Path], None],
+                 copy_file: Callable[[Path, Path, os.stat_result], None], archive: bool = False):
+        """
+        初始化输出目标
+        
+        Args:
+            root: 输出目录
+            ensure_dir: 创建目录的函数（由保护器提供，带缓存）
+            copy_file: 非归档模式下复制数据文件的函数（由保护器提供，支持增量）
+            archive: 是否写入zip归档
+        """
+        self.root = root
+        self.ensure_dir = ensure_dir
+        self.copy_file = copy_file
+        self.archive = zipfile.ZipFile(root / ARCHIVE_NAME, 'w', compression=zipfile.ZIP_STORED) if archive else None
+        # 已写入归档的目录条目
+        self._archive_dirs: Set[str] = set()
+    
+    def _archive_name(self, rel_path: Path) -> str:
+        """
+        获取归档内的条目名，并补齐尚未写入的上级目录条目
+        
+        Args:
+            rel_path: 相对路径
+            
+        Returns:
+            str: 归档条目名
+        """
+        name = rel_path.as_posix()
+        parts = name.split('/')[:-1]
+        for i in range(1, len(parts) + 1):
+            dir_name = '/'.join(parts[:i]) + '/'
+            if dir_name not in self._archive_dirs:
+                self._archive_dirs.add(dir_name)
+                self.archive.writestr(zipfile.ZipInfo(dir_name), b'')
+        return name
+    
+    def target(self, rel_path: Path) -> Optional[str]:
+        """
+        获取进程池任务直接写入的目标文件路径
+        
+        Args:
+            rel_path: 相对路径
+            
+        Returns:
+            Optional[str]: 目标文件路径，归档模式下为None（由任务返回数据）
+        """
+        return None if self.archive else str(self.root / rel_path)
+    
+    def prepare_dirs(self, rel_paths: List[Path]):
+        """
+        统一创建目标目录，写入阶段不再逐文件检查
+        
+        Args:
+            rel_paths: 将要写入的相对路径列表
+        """
+        if self.archive:
+            return
+        for dest_dir in {self.root / rel_path.parent for rel_path in rel_paths}:
+            self.ensure_dir(dest_dir)
+    
+    def add_source(self, src_file: Path, rel_path: Path, src_stat: os.stat_result):
+        """
+        输出保留的源文件
+        
+        Args:
+            src_file: 源文件
+            rel_path: 相对路径
+            src_stat: 源文件stat结果
+        """
+        if self.archive:
+            self.archive.write(src_file, self._archive_name(rel_path))
+            return
+        dest_file = self.root / rel_path
+        self.ensure_dir(dest_file.parent)
+        fast_copy(src_file, dest_file, src_stat)
+    
+    def add_data_file(self, src_file: Path, rel_path: Path, src_stat: os.stat_result):
+        """
+        输出非Python数据文件（归档模式下与模块一起写入归档）
+        
+        Args:
+            src_file: 源文件
+            rel_path: 相对路径
+            src_stat: 源文件stat结果
+        """
+        if self.archive:
+            self.archive.write(src_file, self._archive_name(rel_path))
+            return
+        self.copy_file(src_file, self.root / rel_path, src_stat)
+    
+    def add_data(self, rel_path: Path, data: Optional[bytes]):
+        """
+        写入进程池任务返回的数据（仅归档模式下有数据）
+        
+        Args:
+            rel_path: 相对路径
+            data: 输出内容
+        """
+        if self.archive and data is not None:
+            self.archive.writestr(self._archive_name(rel_path), data)
+    
+    def close(self):
+        """关闭归档文件"""
+        if self.archive:
+            self.archive.close()
+
 
 class CodeProtector:
     """代码保护器
@@ -60,6 +664,7 @@ class CodeProtector:
         
         # 确保目录存在
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        setup_logging(self.output_dir)
         
         # 保护配置
         self.config = {
@@ -84,17 +689,40 @@ class CodeProtector:
                 "core/",
                 "engine/",
                 "algorithms/"
-            ]
+            ],
+            # 混淆方式: ast（基于语法树）或 simple（基于文本行）
+            "obfuscation_mode": "ast",
+            # 字节码优化级别（同 python -OO，移除assert和文档字符串）
+            "optimize": 2,
+            # 是否将Python模块输出到不压缩的zip归档（可由zipimport直接导入）
+            "archive_output": False,
+            # 增量模式：跳过输出比源文件新的文件（归档模式下不生效）
+            "incremental": True
         }
         
+        # 已创建的输出目录，避免逐文件重复mkdir
+        self._created_dirs: Set[Path] = set()
+        
+        # 预编译的匹配模式缓存: 配置项 -> (模式元组, 正则)
+        self._pattern_cache: Dict[str, Tuple[tuple, "re.Pattern"]] = {}
+        
+        # 本次运行已完整生成（无错误）的字节码目录（非归档模式），供分层保护直接复用
+        self._bytecode_dir: Optional[Path] = None
+        
+        # 源代码目录遍历结果缓存: ((源目录, 排除模式), 文件列表)
+        self._scan_cache: Optional[Tuple[tuple, List[SourceEntry]]] = None
+        
         logger.info(f"代码保护器初始化完成")
         logger.info(f"源目录: {self.source_dir}")
         logger.info(f"输出目录: {self.output_dir}")
     
-    def protect_bytecode(self) -> bool:
+    def protect_bytecode(self, files: Optional[List[SourceEntry]] = None) -> bool:
         """
         字节码保护：将Python源码编译为字节码文件
         
+        Args:
+            files: 预先遍历得到的文件列表，未提供时遍历源代码目录
+        
         Returns:
             bool: 保护是否成功
         """
@@ -110,51 +738,76 @@ class CodeProtector:
                 "total_files": 0,
                 "compiled_files": 0,
                 "skipped_files": 0,
+                "unchanged_files": 0,
                 "error_files": 0
             }
             
-            # 遍历源代码目录
-            for py_file in self._find_python_files():
+            archive = self.config.get("archive_output", False)
+            incremental = (self.config.get("incremental", True) and not archive and
+                           self._consume_stamp(bytecode_dir, "bytecode"))
+            output = _ProtectedOutput(bytecode_dir, self._ensure_dir, self._copy_non_python_file, archive)
+            
+            # 遍历源代码目录，收集需要编译的文件
+            if files is None:
+                files = self._scan_source_tree()
+            compile_jobs = []
+            for py_file, rel_path, is_python, src_stat in files:
+                # 非Python文件直接复制
+                if not is_python:
+                    output.add_data_file(py_file, rel_path, src_stat)
+                    continue
+                
                 stats["total_files"] += 1
                 
                 try:
-                    # 计算相对路径
-                    rel_path = py_file.relative_to(self.source_dir)
-                    
                     # 检查是否需要保留源文件
                     if self._should_keep_source(rel_path):
                         # 复制源文件
-                        dest_file = bytecode_dir / rel_path
-                        dest_file.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(py_file, dest_file)
+                        output.add_source(py_file, rel_path, src_stat)
                         stats["skipped_files"] += 1
-                        logger.debug(f"保留源文件: {rel_path}")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"保留源文件: {rel_path}")
                         continue
                     
-                    # 编译为字节码
-                    pyc_file = self._compile_to_bytecode(py_file, bytecode_dir, rel_path)
+                    if incremental and self._is_up_to_date(src_stat, bytecode_dir / rel_path.with_suffix(".pyc"),
+                                                           py_file):
+                        stats["unchanged_files"] += 1
+                        continue
                     
-                    if pyc_file:
-                        stats["compiled_files"] += 1
-                        logger.debug(f"编译成功: {rel_path} -> {pyc_file.name}")
-                    else:
-                        stats["error_files"] += 1
-                        logger.warning(f"编译失败: {rel_path}")
+                    compile_jobs.append((py_file, rel_path))
                         
                 except Exception as e:
                     stats["error_files"] += 1
                     logger.error(f"处理文件失败 {py_file}: {e}")
             
-            # 复制非Python文件
-            self._copy_non_python_files(bytecode_dir)
+            # 一次性批量编译为字节码
+            try:
+                pyc_files = self._compile_batch(compile_jobs, output)
+            finally:
+                output.close()
+            
+            for (py_file, rel_path), pyc_file in zip(compile_jobs, pyc_files):
+                if pyc_file:
+                    stats["compiled_files"] += 1
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"编译成功: {rel_path} -> {pyc_file.name}")
+                else:
+                    stats["error_files"] += 1
+                    logger.warning(f"编译失败: {rel_path}")
+            
+            # 只有完整成功的字节码输出才供分层保护复用
+            self._bytecode_dir = bytecode_dir if not archive and stats["error_files"] == 0 else None
             
             # 生成保护报告
             self._generate_protection_report(bytecode_dir, "bytecode", stats)
+            if not archive and stats["error_files"] == 0:
+                self._write_stamp(bytecode_dir, "bytecode")
             
             logger.info(f"字节码保护完成")
             logger.info(f"总文件数: {stats['total_files']}")
             logger.info(f"编译文件数: {stats['compiled_files']}")
             logger.info(f"保留文件数: {stats['skipped_files']}")
+            logger.info(f"未变更文件数: {stats['unchanged_files']}")
             logger.info(f"错误文件数: {stats['error_files']}")
             
             return stats["error_files"] == 0
@@ -163,10 +816,13 @@ class CodeProtector:
             logger.error(f"字节码保护失败: {e}")
             return False
     
-    def protect_obfuscate(self) -> bool:
+    def protect_obfuscate(self, files: Optional[List[SourceEntry]] = None) -> bool:
         """
         代码混淆保护：对源代码进行混淆处理
         
+        Args:
+            files: 预先遍历得到的文件列表，未提供时遍历源代码目录
+        
         Returns:
             bool: 保护是否成功
         """
@@ -182,49 +838,72 @@ class CodeProtector:
                 "total_files": 0,
                 "obfuscated_files": 0,
                 "skipped_files": 0,
+                "unchanged_files": 0,
                 "error_files": 0
             }
             
-            # 遍历源代码目录
-            for py_file in self._find_python_files():
+            archive = self.config.get("archive_output", False)
+            incremental = (self.config.get("incremental", True) and not archive and
+                           self._consume_stamp(obfuscated_dir, "obfuscation"))
+            output = _ProtectedOutput(obfuscated_dir, self._ensure_dir, self._copy_non_python_file, archive)
+            
+            # 遍历源代码目录，收集需要混淆的文件
+            if files is None:
+                files = self._scan_source_tree()
+            obfuscate_jobs = []
+            for py_file, rel_path, is_python, src_stat in files:
+                # 非Python文件直接复制
+                if not is_python:
+                    output.add_data_file(py_file, rel_path, src_stat)
+                    continue
+                
                 stats["total_files"] += 1
                 
                 try:
-                    # 计算相对路径
-                    rel_path = py_file.relative_to(self.source_dir)
-                    
                     # 检查是否需要保留源文件
                     if self._should_keep_source(rel_path):
                         # 复制源文件
-                        dest_file = obfuscated_dir / rel_path
-                        dest_file.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(py_file, dest_file)
+                        output.add_source(py_file, rel_path, src_stat)
                         stats["skipped_files"] += 1
-                        logger.debug(f"保留源文件: {rel_path}")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"保留源文件: {rel_path}")
                         continue
                     
-                    # 混淆代码
-                    if self._obfuscate_file(py_file, obfuscated_dir, rel_path):
-                        stats["obfuscated_files"] += 1
-                        logger.debug(f"混淆成功: {rel_path}")
-                    else:
-                        stats["error_files"] += 1
-                        logger.warning(f"混淆失败: {rel_path}")
+                    if incremental and self._is_up_to_date(src_stat, obfuscated_dir / rel_path):
+                        stats["unchanged_files"] += 1
+                        continue
+                    
+                    obfuscate_jobs.append((py_file, rel_path))
                         
                 except Exception as e:
                     stats["error_files"] += 1
                     logger.error(f"处理文件失败 {py_file}: {e}")
             
-            # 复制非Python文件
-            self._copy_non_python_files(obfuscated_dir)
+            # 并行混淆代码
+            try:
+                results = self._obfuscate_batch(obfuscate_jobs, output)
+            finally:
+                output.close()
+            
+            for (py_file, rel_path), ok in zip(obfuscate_jobs, results):
+                if ok:
+                    stats["obfuscated_files"] += 1
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"混淆成功: {rel_path}")
+                else:
+                    stats["error_files"] += 1
+                    logger.warning(f"混淆失败: {rel_path}")
             
             # 生成保护报告
             self._generate_protection_report(obfuscated_dir, "obfuscation", stats)
+            if not archive and stats["error_files"] == 0:
+                self._write_stamp(obfuscated_dir, "obfuscation")
             
             logger.info(f"代码混淆保护完成")
             logger.info(f"总文件数: {stats['total_files']}")
             logger.info(f"混淆文件数: {stats['obfuscated_files']}")
             logger.info(f"保留文件数: {stats['skipped_files']}")
+            logger.info(f"未变更文件数: {stats['unchanged_files']}")
             logger.info(f"错误文件数: {stats['error_files']}")
             
             return stats["error_files"] == 0
@@ -258,15 +937,27 @@ class CodeProtector:
             # 复制API定义
             api_source = self.source_dir / "chs_core_api"
             if api_source.exists():
-                shutil.copytree(api_source, api_dir, dirs_exist_ok=True)
+                shutil.copytree(api_source, api_dir, copy_function=fast_copy, dirs_exist_ok=True)
                 logger.info("API定义复制完成")
             
             # 保护实现代码
             impl_source = self.source_dir / "chs_core"
-            if impl_source.exists():
+            built_impl = self._bytecode_dir / "chs_core" if self._bytecode_dir else None
+            if built_impl is not None and built_impl.is_dir():
+                # 直接复用本次运行已生成的字节码，以硬链接方式放入实现包
+                shutil.copytree(built_impl, impl_dir / "bytecode", copy_function=link_or_copy,
+                                dirs_exist_ok=True)
+                logger.info("实现代码保护完成（复用字节码输出）")
+            elif impl_source.exists():
                 # 对实现代码进行字节码编译
+                # 复用本保护器的遍历结果，只取实现代码子目录
+                impl_files = [
+                    (path, rel_path.relative_to("chs_core"), is_python, src_stat)
+                    for path, rel_path, is_python, src_stat in self._scan_source_tree()
+                    if rel_path.parts[0] == "chs_core"
+                ]
                 temp_protector = CodeProtector(str(impl_source), str(impl_dir))
-                if temp_protector.protect_bytecode():
+                if temp_protector.protect_bytecode(impl_files):
                     logger.info("实现代码保护完成")
                 else:
                     logger.warning("实现代码保护部分失败")
@@ -293,15 +984,21 @@ class CodeProtector:
         success_count = 0
         total_methods = 3
         
+        # 源代码目录只遍历一次，各保护方法共享同一文件列表
+        files = self._scan_source_tree()
+        
+        # 字节码保护与代码混淆保护共享一次遍历和一次读取
+        bytecode_ok, obfuscate_ok = self._protect_bytecode_and_obfuscate(files)
+        
         # 字节码保护
-        if self.protect_bytecode():
+        if bytecode_ok:
             success_count += 1
             logger.info("✓ 字节码保护成功")
         else:
             logger.error("✗ 字节码保护失败")
         
         # 代码混淆保护
-        if self.protect_obfuscate():
+        if obfuscate_ok:
             success_count += 1
             logger.info("✓ 代码混淆保护成功")
         else:
@@ -319,24 +1016,205 @@ class CodeProtector:
         
         return success_rate >= 0.5  # 至少50%的方法成功
     
-    def _find_python_files(self) -> List[Path]:
+    def _protect_bytecode_and_obfuscate(self, files: Optional[List[SourceEntry]] = None) -> Tuple[bool, bool]:
         """
-        查找所有Python文件
+        融合的字节码保护与代码混淆保护
+        
+        源代码目录只遍历一次，每个Python文件只读取一次，读取到的源码同时分发给
+        字节码编译和代码混淆两个输出。
+        
+        Args:
+            files: 预先遍历得到的文件列表，未提供时遍历源代码目录
         
         Returns:
-            List[Path]: Python文件列表
+            Tuple[bool, bool]: (字节码保护是否成功, 代码混淆保护是否成功)
         """
-        python_files = []
-        
-        for root, dirs, files in os.walk(self.source_dir):
-            # 排除不需要的目录
-            dirs[:] = [d for d in dirs if not self._should_exclude(d)]
+        try:
+            logger.info("开始字节码保护与代码混淆保护...")
             
-            for file in files:
-                if file.endswith('.py') and not self._should_exclude(file):
-                    python_files.append(Path(root) / file)
+            bytecode_dir = self.output_dir / "bytecode"
+            obfuscated_dir = self.output_dir / "obfuscated"
+            output_dirs = (bytecode_dir, obfuscated_dir)
+            for output_dir in output_dirs:
+                output_dir.mkdir(parents=True, exist_ok=True)
+            
+            archive = self.config.get("archive_output", False)
+            incremental = (self.config.get("incremental", True) and not archive and
+                           all([self._consume_stamp(bytecode_dir, "bytecode"),
+                                self._consume_stamp(obfuscated_dir, "obfuscation")]))
+            bytecode_output = _ProtectedOutput(bytecode_dir, self._ensure_dir, self._copy_non_python_file, archive)
+            obfuscated_output = _ProtectedOutput(obfuscated_dir, self._ensure_dir, self._copy_non_python_file, archive)
+            outputs = (bytecode_output, obfuscated_output)
+            
+            # 统计信息
+            bytecode_stats = {"total_files": 0, "compiled_files": 0, "skipped_files": 0,
+                              "unchanged_files": 0, "error_files": 0}
+            obfuscate_stats = {"total_files": 0, "obfuscated_files": 0, "skipped_files": 0,
+                               "unchanged_files": 0, "error_files": 0}
+            
+            try:
+                # 遍历源代码目录，每个文件只读取一次
+                if files is None:
+                    files = self._scan_source_tree()
+                sources = []
+                for py_file, rel_path, is_python, src_stat in files:
+                    if not is_python:
+                        for output in outputs:
+                            output.add_data_file(py_file, rel_path, src_stat)
+                        continue
+                    
+                    bytecode_stats["total_files"] += 1
+                    obfuscate_stats["total_files"] += 1
+                    
+                    try:
+                        if self._should_keep_source(rel_path):
+                            for output in outputs:
+                                output.add_source(py_file, rel_path, src_stat)
+                            bytecode_stats["skipped_files"] += 1
+                            obfuscate_stats["skipped_files"] += 1
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug(f"保留源文件: {rel_path}")
+                            continue
+                        
+                        if (incremental and
+                                self._is_up_to_date(src_stat, bytecode_dir / rel_path.with_suffix(".pyc"),
+                                                    py_file) and
+                                self._is_up_to_date(src_stat, obfuscated_dir / rel_path)):
+                            bytecode_stats["unchanged_files"] += 1
+                            obfuscate_stats["unchanged_files"] += 1
+                            continue
+                        
+                        sources.append((py_file, rel_path, py_file.read_bytes(), src_stat))
+                        
+                    except Exception as e:
+                        bytecode_stats["error_files"] += 1
+                        obfuscate_stats["error_files"] += 1
+                        logger.error(f"处理文件失败 {py_file}: {e}")
+                
+                # 每个文件作为一个任务，同时完成编译和混淆
+                pyc_paths = [rel_path.with_suffix(".pyc") for _, rel_path, _, _ in sources]
+                bytecode_output.prepare_dirs(pyc_paths)
+                obfuscated_output.prepare_dirs([rel_path for _, rel_path, _, _ in sources])
+                optimize = self.config.get("optimize", 2)
+                mode = self.config.get("obfuscation_mode", "ast")
+                timestamp = datetime.now().isoformat()
+                process_args = [
+                    (source, rel_path.as_posix(), str(py_file), optimize,
+                     bytecode_output.target(pyc_path), obfuscated_output.target(rel_path), mode, timestamp)
+                    for (py_file, rel_path, source, src_stat), pyc_path in zip(sources, pyc_paths)
+                ]
+                results = _run_parallel(_process_one, process_args, chunksize=8)
+                for (py_file, rel_path, _, _), pyc_path, (compile_result, obfuscate_result) in zip(
+                        sources, pyc_paths, results):
+                    error, data = compile_result
+                    if error:
+                        bytecode_stats["error_files"] += 1
+                        logger.error(f"编译字节码失败 {py_file}: {error}")
+                    else:
+                        bytecode_output.add_data(pyc_path, data)
+                        bytecode_stats["compiled_files"] += 1
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"编译成功: {rel_path}")
+                    
+                    error, data = obfuscate_result
+                    if error:
+                        obfuscate_stats["error_files"] += 1
+                        logger.error(f"混淆文件失败 {py_file}: {error}")
+                    else:
+                        obfuscated_output.add_data(rel_path, data)
+                        obfuscate_stats["obfuscated_files"] += 1
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"混淆成功: {rel_path}")
+            finally:
+                for output in outputs:
+                    output.close()
+            
+            # 只有完整成功的字节码输出才供分层保护复用
+            self._bytecode_dir = bytecode_dir if not archive and bytecode_stats["error_files"] == 0 else None
+            
+            # 生成保护报告
+            self._generate_protection_report(bytecode_dir, "bytecode", bytecode_stats)
+            self._generate_protection_report(obfuscated_dir, "obfuscation", obfuscate_stats)
+            if not archive:
+                if bytecode_stats["error_files"] == 0:
+                    self._write_stamp(bytecode_dir, "bytecode")
+                if obfuscate_stats["error_files"] == 0:
+                    self._write_stamp(obfuscated_dir, "obfuscation")
+            
+            logger.info(f"字节码保护与代码混淆保护完成")
+            logger.info(f"总文件数: {bytecode_stats['total_files']}")
+            logger.info(f"编译文件数: {bytecode_stats['compiled_files']}")
+            logger.info(f"混淆文件数: {obfuscate_stats['obfuscated_files']}")
+            logger.info(f"保留文件数: {bytecode_stats['skipped_files']}")
+            logger.info(f"未变更文件数: {bytecode_stats['unchanged_files']}")
+            logger.info(f"错误文件数: {bytecode_stats['error_files'] + obfuscate_stats['error_files']}")
+            
+            return bytecode_stats["error_files"] == 0, obfuscate_stats["error_files"] == 0
+            
+        except Exception as e:
+            logger.error(f"字节码保护与代码混淆保护失败: {e}")
+            return False, False
+    
+    def _scan_source_tree(self) -> List[SourceEntry]:
+        """
+        获取源代码目录的文件列表
+        
+        遍历结果按源目录和排除模式缓存，同一保护器的多个保护方法共享一次遍历。
+        
+        Returns:
+            List[SourceEntry]: (文件路径, 相对路径, 是否为Python文件, stat结果) 列表
+        """
+        key = (self.source_dir, tuple(self.config["exclude_patterns"]))
+        if self._scan_cache is None or self._scan_cache[0] != key:
+            self._scan_cache = (key, list(self._walk_source_tree()))
+        return self._scan_cache[1]
+    
+    def _walk_source_tree(self) -> Iterator[SourceEntry]:
+        """
+        遍历源代码目录（单次遍历，同时覆盖Python与非Python文件）
+        
+        使用显式目录栈逐目录调用os.scandir；先按名称排除，再判断条目类型，
+        被排除的条目不会产生任何stat调用。
+        
+        Returns:
+            Iterator[SourceEntry]: (文件路径, 相对路径, 是否为Python文件, stat结果)
+        """
+        exclude_re = self._pattern_regex("exclude_patterns")
+        normcase = os.path.normcase
+        stack = [(str(self.source_dir), Path())]
         
-        return python_files
+        while stack:
+            directory, rel_dir = stack.pop()
+            with os.scandir(directory) as it:
+                for entry in it:
+                    name = entry.name
+                    if exclude_re.match(normcase(name)):
+                        continue
+                    
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, rel_dir / name))
+                    elif entry.is_file():
+                        yield Path(entry.path), rel_dir / name, name.endswith('.py'), entry.stat()
+    
+    def _pattern_regex(self, config_key: str) -> "re.Pattern":
+        """
+        获取配置中glob模式列表对应的预编译正则表达式
+        
+        所有模式合并为一个正则，按模式列表缓存；配置更新后自动重新编译。
+        
+        Args:
+            config_key: 配置项名称
+            
+        Returns:
+            re.Pattern: 预编译的正则表达式
+        """
+        patterns = tuple(self.config[config_key])
+        cached = self._pattern_cache.get(config_key)
+        if cached is None or cached[0] != patterns:
+            regex = re.compile('|'.join(fnmatch.translate(os.path.normcase(p)) for p in patterns) or r'(?!)')
+            cached = (patterns, regex)
+            self._pattern_cache[config_key] = cached
+        return cached[1]
     
     def _should_exclude(self, name: str) -> bool:
         """
@@ -348,13 +1226,7 @@ class CodeProtector:
         Returns:
             bool: 是否应该排除
         """
-        import fnmatch
-        
-        for pattern in self.config["exclude_patterns"]:
-            if fnmatch.fnmatch(name, pattern):
-                return True
-        
-        return False
+        return self._pattern_regex("exclude_patterns").match(os.path.normcase(name)) is not None
     
     def _should_keep_source(self, rel_path: Path) -> bool:
         """
@@ -366,140 +1238,182 @@ class CodeProtector:
         Returns:
             bool: 是否保留源文件
         """
-        import fnmatch
+        keep_re = self._pattern_regex("keep_source_files")
+        return (keep_re.match(os.path.normcase(str(rel_path))) is not None or
+                keep_re.match(os.path.normcase(rel_path.name)) is not None)
+    
+    def _compile_batch(self, jobs: List[Tuple[Path, Path]], output: _ProtectedOutput) -> List[Optional[Path]]:
+        """
+        批量编译Python文件为字节码
+        
+        文件数量较多时使用进程池并行编译。
+        
+        Args:
+            jobs: (源文件, 相对路径) 列表
+            output: 输出目标
+            
+        Returns:
+            List[Optional[Path]]: 与jobs一一对应的字节码文件相对路径，失败时为None
+        """
+        pyc_paths = [rel_path.with_suffix(".pyc") for _, rel_path in jobs]
+        output.prepare_dirs(pyc_paths)
         
-        path_str = str(rel_path)
+        optimize = self.config.get("optimize", 2)
+        compile_args = [(str(py_file), output.target(pyc_path), optimize)
+                        for (py_file, _), pyc_path in zip(jobs, pyc_paths)]
         
-        for pattern in self.config["keep_source_files"]:
-            if fnmatch.fnmatch(path_str, pattern) or fnmatch.fnmatch(rel_path.name, pattern):
-                return True
+        results = []
+        for (py_file, _), pyc_path, (error, data) in zip(jobs, pyc_paths,
+                                                         _run_parallel(_compile_job, compile_args, chunksize=4)):
+            if error:
+                logger.error(f"编译字节码失败 {py_file}: {error}")
+                results.append(None)
+            else:
+                output.add_data(pyc_path, data)
+                results.append(pyc_path)
         
-        return False
+        return results
     
-    def _compile_to_bytecode(self, py_file: Path, output_dir: Path, rel_path: Path) -> Optional[Path]:
+    def _obfuscate_batch(self, jobs: List[Tuple[Path, Path]], output: _ProtectedOutput) -> List[bool]:
         """
-        将Python文件编译为字节码
+        批量混淆Python文件
+        
+        文件数量较多时使用进程池并行混淆。
         
         Args:
-            py_file: 源Python文件
-            output_dir: 输出目录
-            rel_path: 相对路径
+            jobs: (源文件, 相对路径) 列表
+            output: 输出目标
             
         Returns:
-            Optional[Path]: 编译后的字节码文件路径，失败时返回None
+            List[bool]: 与jobs一一对应的混淆结果
         """
-        try:
-            # 创建目标目录
-            dest_dir = output_dir / rel_path.parent
-            dest_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 编译为字节码
-            pyc_file = dest_dir / f"{rel_path.stem}.pyc"
-            
-            # 使用py_compile编译
-            py_compile.compile(str(py_file), str(pyc_file), doraise=True)
-            
-            return pyc_file
-            
-        except Exception as e:
-            logger.error(f"编译字节码失败 {py_file}: {e}")
-            return None
+        output.prepare_dirs([rel_path for _, rel_path in jobs])
+        
+        mode = self.config.get("obfuscation_mode", "ast")
+        timestamp = datetime.now().isoformat()
+        obfuscate_args = [(str(py_file), output.target(rel_path), rel_path.as_posix(), mode, timestamp)
+                          for py_file, rel_path in jobs]
+        
+        results = []
+        for (py_file, rel_path), (error, data) in zip(jobs, _run_parallel(_obfuscate_job, obfuscate_args, chunksize=8)):
+            if error:
+                logger.error(f"混淆文件失败 {py_file}: {error}")
+            else:
+                output.add_data(rel_path, data)
+            results.append(not error)
+        
+        return results
     
-    def _obfuscate_file(self, py_file: Path, output_dir: Path, rel_path: Path) -> bool:
+    def _is_up_to_date(self, src_stat: os.stat_result, dest_file: Path,
+                       src_file: Optional[Path] = None) -> bool:
         """
-        混淆Python文件
+        检查输出文件是否已是最新
+        
+        输出文件不早于源文件时视为最新；.pyc文件还需头部的魔数与当前解释器一致、为checked-hash模式，
+        且头部记录的源码哈希与当前源文件一致（保留mtime的复制不会掩盖源码变化）。
         
         Args:
-            py_file: 源Python文件
-            output_dir: 输出目录
-            rel_path: 相对路径
+            src_stat: 源文件stat结果
+            dest_file: 输出文件
+            src_file: 源文件，检查.pyc输出时用于校验源码哈希
             
         Returns:
-            bool: 混淆是否成功
+            bool: 输出文件是否可以直接复用
         """
         try:
-            # 创建目标目录
-            dest_dir = output_dir / rel_path.parent
-            dest_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 读取源文件
-            with open(py_file, 'r', encoding='utf-8') as f:
-                source_code = f.read()
-            
-            # 简单的混淆处理（实际项目中可以使用更复杂的混淆工具）
-            obfuscated_code = self._simple_obfuscate(source_code)
-            
-            # 写入混淆后的文件
-            dest_file = dest_dir / rel_path.name
-            with open(dest_file, 'w', encoding='utf-8') as f:
-                f.write(obfuscated_code)
-            
+            if dest_file.stat().st_mtime_ns < src_stat.st_mtime_ns:
+                return False
+            if dest_file.suffix == ".pyc":
+                if src_file is None:
+                    return False
+                with open(dest_file, 'rb') as f:
+                    header = f.read(_PYC_HEADER_SIZE)
+                if header[:len(_PYC_HEADER_PREFIX)] != _PYC_HEADER_PREFIX:
+                    return False
+                return header[len(_PYC_HEADER_PREFIX):] == importlib.util.source_hash(src_file.read_bytes())
             return True
-            
-        except Exception as e:
-            logger.error(f"混淆文件失败 {py_file}: {e}")
+        except OSError:
             return False
     
-    def _simple_obfuscate(self, source_code: str) -> str:
+    def _protection_stamp(self, method: str) -> str:
         """
-        简单的代码混淆
+        生成指定保护方法的配置戳内容
         
         Args:
-            source_code: 源代码
+            method: 保护方法（bytecode或obfuscation）
             
         Returns:
-            str: 混淆后的代码
+            str: 影响该方法输出内容的配置项的JSON表示
+        """
+        keys = _STAMP_CONFIG_KEYS[method]
+        return json.dumps({key: self.config.get(key) for key in keys}, sort_keys=True)
+    
+    def _consume_stamp(self, output_dir: Path, method: str) -> bool:
         """
-        # 这是一个简化的混淆示例
-        # 实际项目中应该使用专业的混淆工具如 pyarmor
+        读取并移除输出目录的配置戳，检查其是否与当前配置一致
         
-        lines = source_code.split('\n')
-        obfuscated_lines = []
+        配置戳不一致时所有输出都需重新生成；读取后即移除，中途失败或中断的运行
+        不会留下与输出内容不符的配置戳。
         
-        for line in lines:
-            # 移除注释（保留文档字符串）
-            if line.strip().startswith('#') and '"""' not in line and "'''" not in line:
-                continue
-            
-            # 移除空行
-            if not line.strip():
-                continue
-            
-            # 添加混淆标记
-            if line.strip() and not line.startswith('    '):
-                obfuscated_lines.append(f"# Obfuscated at {datetime.now().isoformat()}")
+        Args:
+            output_dir: 输出目录
+            method: 保护方法
             
-            obfuscated_lines.append(line)
+        Returns:
+            bool: 配置戳是否一致
+        """
+        stamp_file = output_dir / PROTECTION_STAMP_FILE
+        try:
+            stamp = stamp_file.read_text(encoding='utf-8')
+            stamp_file.unlink()
+        except OSError:
+            return False
+        return stamp == self._protection_stamp(method)
+    
+    def _write_stamp(self, output_dir: Path, method: str):
+        """
+        写入输出目录的配置戳（仅在全部文件处理成功后调用）
         
-        return '\n'.join(obfuscated_lines)
+        Args:
+            output_dir: 输出目录
+            method: 保护方法
+        """
+        try:
+            (output_dir / PROTECTION_STAMP_FILE).write_text(self._protection_stamp(method), encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"写入配置戳失败 {output_dir}: {e}")
+    
+    def _ensure_dir(self, directory: Path):
+        """
+        创建目录（已创建过的目录直接跳过）
+        
+        Args:
+            directory: 目录路径
+        """
+        if directory in self._created_dirs:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        self._created_dirs.add(directory)
     
-    def _copy_non_python_files(self, output_dir: Path):
+    def _copy_non_python_file(self, src_file: Path, dest_file: Path, src_stat: os.stat_result):
         """
         复制非Python文件
         
         Args:
-            output_dir: 输出目录
+            src_file: 源文件
+            dest_file: 目标文件
+            src_stat: 源文件stat结果
         """
         try:
-            for root, dirs, files in os.walk(self.source_dir):
-                # 排除不需要的目录
-                dirs[:] = [d for d in dirs if not self._should_exclude(d)]
-                
-                for file in files:
-                    if not file.endswith('.py') and not self._should_exclude(file):
-                        src_file = Path(root) / file
-                        rel_path = src_file.relative_to(self.source_dir)
-                        dest_file = output_dir / rel_path
-                        
-                        # 创建目标目录
-                        dest_file.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        # 复制文件
-                        shutil.copy2(src_file, dest_file)
-                        logger.debug(f"复制非Python文件: {rel_path}")
+            if self.config.get("incremental", True) and self._is_up_to_date(src_stat, dest_file):
+                return
+            self._ensure_dir(dest_file.parent)
+            fast_copy(src_file, dest_file, src_stat)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"复制非Python文件: {dest_file.name}")
         
         except Exception as e:
-            logger.error(f"复制非Python文件失败: {e}")
+            logger.error(f"复制非Python文件失败 {src_file}: {e}")
     
     def _generate_protection_report(self, output_dir: Path, method: str, stats: Dict[str, int]):
         """
@@ -521,8 +1435,14 @@ class CodeProtector:
             }
             
             report_file = output_dir / "protection_report.json"
-            with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                # orjson直接输出UTF-8字节，无需再经文本层编码
+                with open(report_file, 'wb') as f:
+                    f.write(orjson.dumps(report, default=str,
+                                         option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(report_file, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, indent=2, ensure_ascii=False, default=str)
             
             logger.info(f"保护报告已生成: {report_file}")
             
@@ -679,6 +1599,18 @@ def main():
         help="详细输出"
     )
     
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="将Python模块输出到不压缩的zip归档"
+    )
+    
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="忽略增量检查，重新生成全部输出"
+    )
+    
     parser.add_argument(
         "--config",
         help="配置文件路径（JSON格式）"
@@ -686,6 +1618,9 @@ def main():
     
     args = parser.parse_args()
     
+    # 日志文件写入输出目录
+    setup_logging(args.output)
+    
     # 设置日志级别
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -706,6 +1641,11 @@ def main():
                 protector.config.update(custom_config)
                 logger.info(f"已加载自定义配置: {args.config}")
         
+        if args.archive:
+            protector.config["archive_output"] = True
+        if args.force:
+            protector.config["incremental"] = False
+        
         # 执行保护
         success = False
         
@@ -20,16 +20,37 @@ import os
 import sys
 import shutil
 import argparse
+import asyncio
 import subprocess
+import selectors
+import codecs
+import io
+import hashlib
+import tempfile
+import logging
+import importlib.util
+import importlib.metadata
 import json
+import threading
+import time
+import atexit
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, Final, List, Mapping, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.file_copy import fast_copy
+
 try:
     from scripts.protect_code import CodeProtector
     from scripts.build_protected import ProtectedBuilder
@@ -41,16 +62,109 @@ except ImportError as e:
     ProtectedBuilder = None
     LayeredPackager = None
 
+# 各保护级别对应的分层保护配置（只读）
+_PROTECTION_CONFIG: Final[Mapping[str, Mapping[str, str]]] = MappingProxyType({
+    "bytecode": MappingProxyType({"api": "source", "core": "bytecode", "algorithms": "bytecode"}),
+    "obfuscated": MappingProxyType({"api": "source", "core": "obfuscated", "algorithms": "obfuscated"}),
+    "all": MappingProxyType({"api": "source", "core": "obfuscated", "algorithms": "encrypted"})
+})
+
+# 子进程管道读取缓冲区大小
+PIPE_BUFSIZE = 65536
+
+# 计算源码树哈希时跳过的目录（构建产物和工具缓存）
+TREE_HASH_SKIP_DIRS = {"build", "dist", "__pycache__", "node_modules"}
+# 参与源码树哈希的文件类型（源码及检查工具配置）
+TREE_HASH_SUFFIXES = (".py", ".cfg", ".toml", ".ini")
+
+# 检查工具的配置文件查找顺序: (文件名, 配置节标记)，与工具自身在项目目录中的查找规则一致
+FLAKE8_CONFIG_FILES = (("setup.cfg", "[flake8]"), ("tox.ini", "[flake8]"), (".flake8", "[flake8]"))
+MYPY_CONFIG_FILES = (("mypy.ini", "[mypy]"), (".mypy.ini", "[mypy]"),
+                     ("pyproject.toml", "[tool.mypy]"), ("setup.cfg", "[mypy]"))
+# 无论扩展名、是否为隐藏文件都参与源码树哈希的检查工具配置文件
+TREE_HASH_CONFIG_FILES = frozenset(name for name, _ in FLAKE8_CONFIG_FILES + MYPY_CONFIG_FILES)
+
+
+def _is_package_installed(package: str) -> bool:
+    """检查包是否已安装：先查已安装的分发包元数据，再退回按模块名查找"""
+    try:
+        importlib.metadata.distribution(package)
+        return True
+    except importlib.metadata.PackageNotFoundError:
+        return importlib.util.find_spec(package) is not None
+
+
+def _collect_tree_files(src_root, dst_root,
+                        ignore: Optional[Callable] = None) -> List[Tuple[str, str]]:
+    """
+    收集目录树中待复制的 (源文件, 目标文件) 路径对
+    
+    ignore与shutil.copytree的同名参数约定一致（如shutil.ignore_patterns），
+    每个目录调用一次；被忽略的目录在目录层面剪除，不再遍历其内容。
+    """
+    src_root = os.fspath(src_root).rstrip(os.sep)
+    dst_root = os.fspath(dst_root)
+    # os.walk产生的dirpath均以src_root开头，直接切片得到相对路径
+    prefix_len = len(src_root) + 1
+    
+    pairs = []
+    for dirpath, dirnames, filenames in os.walk(src_root):
+        if ignore is not None:
+            ignored = ignore(dirpath, dirnames + filenames)
+            if ignored:
+                dirnames[:] = [d for d in dirnames if d not in ignored]
+                filenames = [f for f in filenames if f not in ignored]
+        rel_dir = dirpath[prefix_len:]
+        target_dir = os.path.join(dst_root, rel_dir) if rel_dir else dst_root
+        for name in filenames:
+            pairs.append((os.path.join(dirpath, name), os.path.join(target_dir, name)))
+    return pairs
+
+
+# 清理时待删除目录重命名使用的后缀
+TRASH_SUFFIX = ".trash-"
+
+# 并行复制文件的线程数（复制以I/O等待为主）
+COPY_WORKERS = 16
+
+# 复制文档时忽略的文件和目录
+DOCS_IGNORE = shutil.ignore_patterns(".*", "__pycache__", "*.pyc")
+
+
+def _copy_files_parallel(pairs: List[Tuple[str, str]]):
+    """并行复制文件；目标目录预先一次性创建，避免线程间竞争"""
+    for directory in sorted({os.path.dirname(dst) for _, dst in pairs}):
+        os.makedirs(directory, exist_ok=True)
+    
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+        list(executor.map(lambda pair: fast_copy(*pair), pairs))
+
 
 class CorePublisher:
     """CHS-Core 发布管理器"""
     
-    def __init__(self, project_root: Path, target_dir: Path):
+    def __init__(self, project_root: Path, target_dir: Path, clean: bool = False):
         self.project_root = project_root
         self.target_dir = target_dir
+        # 是否在复制前清空发布目录中已有的分层包（默认增量覆盖）
+        self.clean = clean
         self.build_dir = project_root / "build" / "release"
         self.dist_dir = project_root / "dist"
         self.log_file = project_root / "publish.log"
+        # 复制阶段使用的源目录路径字符串，循环内直接用os.path拼接
+        self._docs_src = str(project_root / "docs")
+        self._scripts_src = str(project_root / "scripts")
+        self._log_lock = threading.Lock()
+        # 日志文件只打开一次，进程退出时关闭
+        self._log_fh = open(self.log_file, "a", encoding="utf-8", buffering=8192)
+        atexit.register(self._log_fh.close)
+        
+        # 检查结果缓存: 检查名称 -> 上次通过时的源码树哈希
+        # 构建目录会被构建和清理步骤删除，缓存内容同时保存在内存中，清理后写回
+        self.check_cache_file = project_root / "build" / ".check_cache.json"
+        self._check_cache: Dict[str, str] = {}
+        self._check_cache_lock = threading.Lock()
+        self._tree_hash_value: Optional[str] = None
         
         # 确保目标目录存在
         self.target_dir.mkdir(parents=True, exist_ok=True)
@@ -70,12 +184,16 @@ class CorePublisher:
     
     def log(self, message: str, level: str = "INFO"):
         """记录日志"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
         log_entry = f"[{timestamp}] {level}: {message}"
-        print(log_entry)
         
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(log_entry + "\n")
+        # 质量检查与测试并行执行时，保证日志行不交错
+        with self._log_lock:
+            print(log_entry)
+            self._log_fh.write(log_entry + "\n")
+            # 错误日志立即落盘，便于进程异常退出后排查
+            if level == "ERROR":
+                self._log_fh.flush()
     
     def run_command(self, command: List[str], cwd: Optional[Path] = None) -> bool:
         """执行命令"""
@@ -85,29 +203,152 @@ class CorePublisher:
         self.log(f"执行命令: {' '.join(command)}")
         
         try:
-            result = subprocess.run(
+            with subprocess.Popen(
                 command,
                 cwd=cwd,
-                capture_output=True,
-                text=True,
-                encoding="utf-8"
-            )
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=PIPE_BUFSIZE
+            ) as proc:
+                stdout, stderr = self._read_process_output(proc)
+                returncode = proc.wait()
             
-            if result.returncode == 0:
-                self.log(f"命令执行成功: {' '.join(command)}")
-                if result.stdout:
-                    self.log(f"输出: {result.stdout.strip()}")
-                return True
-            else:
-                self.log(f"命令执行失败: {' '.join(command)}", "ERROR")
-                if result.stderr:
-                    self.log(f"错误: {result.stderr.strip()}", "ERROR")
-                return False
+            return self._report_command_result(command, returncode, stdout, stderr)
                 
         except Exception as e:
             self.log(f"命令执行异常: {e}", "ERROR")
             return False
     
+    async def run_command_async(self, command: List[str], cwd: Optional[Path] = None) -> bool:
+        """异步执行命令（等待子进程期间事件循环可继续调度其他任务）"""
+        if cwd is None:
+            cwd = self.project_root
+        
+        self.log(f"执行命令: {' '.join(command)}")
+        
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *command,
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await proc.communicate()
+            
+            return self._report_command_result(
+                command, proc.returncode,
+                stdout.decode("utf-8", "replace"), stderr.decode("utf-8", "replace")
+            )
+            
+        except Exception as e:
+            self.log(f"命令执行异常: {e}", "ERROR")
+            return False
+    
+    def _report_command_result(self, command: List[str], returncode: int, stdout: str, stderr: str) -> bool:
+        """记录命令执行结果"""
+        if returncode == 0:
+            self.log(f"命令执行成功: {' '.join(command)}")
+            if stdout:
+                self.log(f"输出: {stdout.strip()}")
+            return True
+        else:
+            self.log(f"命令执行失败: {' '.join(command)}", "ERROR")
+            if stderr:
+                self.log(f"错误: {stderr.strip()}", "ERROR")
+            return False
+    
+    def _read_process_output(self, proc: subprocess.Popen) -> Tuple[str, str]:
+        """
+        读取子进程的标准输出和标准错误
+        
+        POSIX上用选择器同时读取两个管道，按块增量解码；子进程退出后即使管道仍被
+        孙进程占用也不会一直阻塞。Windows上管道不支持select，直接等待进程结束。
+        """
+        if os.name == "nt":
+            stdout, stderr = proc.communicate()
+            return stdout.decode("utf-8", "replace"), stderr.decode("utf-8", "replace")
+        
+        buffers = {}
+        with selectors.DefaultSelector() as selector:
+            for pipe in (proc.stdout, proc.stderr):
+                selector.register(pipe, selectors.EVENT_READ)
+                buffers[pipe] = (io.StringIO(), codecs.getincrementaldecoder("utf-8")("replace"))
+            
+            while selector.get_map():
+                events = selector.select(timeout=0.05)
+                if not events and proc.poll() is not None:
+                    break
+                for key, _ in events:
+                    buffer, decoder = buffers[key.fileobj]
+                    chunk = os.read(key.fd, PIPE_BUFSIZE)
+                    if chunk:
+                        buffer.write(decoder.decode(chunk))
+                    else:
+                        buffer.write(decoder.decode(b"", final=True))
+                        selector.unregister(key.fileobj)
+        
+        return buffers[proc.stdout][0].getvalue(), buffers[proc.stderr][0].getvalue()
+    
+    def _tree_hash(self) -> str:
+        """计算源码树哈希（按路径、修改时间和大小，不读取文件内容）"""
+        hasher = hashlib.blake2b(digest_size=16)
+        stack = [str(self.project_root)]
+        while stack:
+            directory = stack.pop()
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+            for entry in entries:
+                name = entry.name
+                is_config = name in TREE_HASH_CONFIG_FILES
+                if (name.startswith(".") and not is_config) or name.endswith(".egg-info"):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if name not in TREE_HASH_SKIP_DIRS:
+                        stack.append(entry.path)
+                elif (is_config or name.endswith(TREE_HASH_SUFFIXES)) and entry.is_file():
+                    st = entry.stat()
+                    hasher.update(f"{entry.path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode("utf-8", "surrogateescape"))
+        return hasher.hexdigest()
+    
+    def _load_check_cache(self) -> Dict[str, str]:
+        """读取检查结果缓存"""
+        try:
+            with open(self.check_cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _run_cached_check(self, name: str, check: Callable[[], bool]) -> bool:
+        """执行检查；源码树自上次通过后未变化时直接跳过
+        
+        设置环境变量 CHS_FORCE_CHECKS=1 可忽略缓存。
+        """
+        with self._check_cache_lock:
+            if self._tree_hash_value is None:
+                self._tree_hash_value = self._tree_hash()
+            tree_hash = self._tree_hash_value
+            cache = self._load_check_cache()
+            self._check_cache.update(cache)
+        
+        if os.environ.get("CHS_FORCE_CHECKS") != "1" and cache.get(name) == tree_hash:
+            self.log(f"{name} 检查结果已缓存（源码未变化），跳过")
+            return True
+        
+        if not check():
+            return False
+        
+        with self._check_cache_lock:
+            self._check_cache.update(self._load_check_cache())
+            self._check_cache[name] = tree_hash
+            self._save_check_cache()
+        return True
+    
+    def _save_check_cache(self):
+        """写入检查结果缓存"""
+        self.check_cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.check_cache_file, "w", encoding="utf-8") as f:
+            json.dump(self._check_cache, f, indent=2)
+    
     def check_dependencies(self) -> bool:
         """检查依赖项"""
         self.log("检查项目依赖...")
@@ -117,13 +358,15 @@ class CorePublisher:
             self.log("Python版本过低，需要3.8+", "ERROR")
             return False
         
-        # 检查必要的包
+        # 检查必要的包（在当前进程内查找，无需为每个包启动子进程）
         required_packages = ["setuptools", "wheel", "build"]
-        for package in required_packages:
-            if not self.run_command([sys.executable, "-c", f"import {package}"]):
-                self.log(f"安装缺失的包: {package}")
-                if not self.run_command([sys.executable, "-m", "pip", "install", package]):
-                    return False
+        missing = [package for package in required_packages if not _is_package_installed(package)]
+        
+        # 缺失的包一次性安装
+        if missing:
+            self.log(f"安装缺失的包: {', '.join(missing)}")
+            if not self.run_command([sys.executable, "-m", "pip", "install", *missing]):
+                return False
         
         return True
     
@@ -131,24 +374,142 @@ class CorePublisher:
         """运行代码质量检查"""
         self.log("运行代码质量检查...")
         
+        self.run_style_check()
+        self.run_type_check()
+        
+        return True
+    
+    def run_style_check(self) -> bool:
+        """运行代码风格检查"""
         # 检查是否有flake8
         try:
-            import flake8
-            if not self.run_command([sys.executable, "-m", "flake8", ".", "--max-line-length=88", "--extend-ignore=E203,W503"]):
+            from flake8.main.application import Application as Flake8Application
+            if not self._run_cached_check("flake8", lambda: self._run_flake8(Flake8Application)):
                 self.log("代码风格检查发现问题，但继续构建", "WARNING")
         except ImportError:
             self.log("flake8未安装，跳过代码风格检查", "WARNING")
         
+        return True
+    
+    def _find_tool_config(self, candidates) -> Optional[Path]:
+        """在项目根目录中按顺序查找包含对应配置节的检查工具配置文件
+        
+        检查在当前进程内运行，不再以项目根目录为工作目录，配置文件需显式传给工具。
+        """
+        for file_name, section in candidates:
+            config_file = self.project_root / file_name
+            try:
+                if section in config_file.read_text(encoding="utf-8"):
+                    return config_file
+            except (OSError, UnicodeDecodeError):
+                continue
+        return None
+    
+    def _run_flake8(self, application_class) -> bool:
+        """在当前进程内调用flake8，避免启动新的解释器"""
+        self.log(f"执行flake8检查: {self.project_root}")
+        
+        # 发布脚本导入的保护模块会配置根日志，避免flake8的运行日志混入输出
+        logging.getLogger("flake8").setLevel(logging.WARNING)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_file = os.path.join(temp_dir, "flake8.txt")
+            config_file = self._find_tool_config(FLAKE8_CONFIG_FILES)
+            # 项目没有flake8配置时忽略工作目录中的配置文件
+            config_arg = f"--config={config_file}" if config_file else "--isolated"
+            app = application_class()
+            # 检查在线程池中与其他检查并行运行，--jobs=1避免flake8在多线程进程中fork子进程池；
+            # 参数或配置错误时flake8经argparse抛出SystemExit，只记为本项检查失败
+            try:
+                app.run([
+                    str(self.project_root),
+                    "--max-line-length=88",
+                    "--extend-ignore=E203,W503",
+                    "--jobs=1",
+                    config_arg,
+                    f"--output-file={output_file}"
+                ])
+            except SystemExit as e:
+                self.log(f"flake8运行失败: 退出码 {e.code}", "ERROR")
+                return False
+            try:
+                with open(output_file, "r", encoding="utf-8") as f:
+                    output = f.read().strip()
+            except OSError:
+                output = ""
+        
+        if app.exit_code() != 0:
+            self.log(f"flake8发现 {app.result_count} 个问题", "ERROR")
+            if output:
+                self.log(f"错误: {output}", "ERROR")
+            return False
+        
+        self.log("flake8检查通过")
+        return True
+    
+    def run_type_check(self) -> bool:
+        """运行类型检查"""
         # 检查是否有mypy
         try:
-            import mypy
-            if not self.run_command([sys.executable, "-m", "mypy", ".", "--ignore-missing-imports"]):
+            from mypy import api as mypy_api
+            if not self._run_cached_check("mypy", lambda: self._run_mypy(mypy_api)):
                 self.log("类型检查发现问题，但继续构建", "WARNING")
         except ImportError:
             self.log("mypy未安装，跳过类型检查", "WARNING")
         
         return True
     
+    def _run_mypy(self, mypy_api) -> bool:
+        """在当前进程内调用mypy，避免启动新的解释器"""
+        self.log(f"执行mypy检查: {self.project_root}")
+        
+        # 配置文件和缓存目录固定在项目根目录下，不随调用方工作目录变化；空字符串表示不使用配置文件
+        config_file = self._find_tool_config(MYPY_CONFIG_FILES)
+        stdout, stderr, exit_status = mypy_api.run([
+            str(self.project_root),
+            "--ignore-missing-imports",
+            f"--config-file={config_file or ''}",
+            f"--cache-dir={self.project_root / '.mypy_cache'}"
+        ])
+        
+        if exit_status != 0:
+            self.log("mypy检查未通过", "ERROR")
+            if stdout or stderr:
+                self.log(f"错误: {(stdout + stderr).strip()}", "ERROR")
+            return False
+        
+        if stdout:
+            self.log(f"输出: {stdout.strip()}")
+        return True
+    
+    def run_checks_parallel(self, skip_tests: bool = False, skip_quality: bool = False):
+        """并行运行代码质量检查和测试
+        
+        flake8、mypy和pytest都是对源码树的只读检查，互不依赖，在线程池中同时执行，
+        总耗时取决于最慢的一项而不是各项之和。
+        """
+        checks = {}
+        if not skip_quality:
+            self.log("运行代码质量检查...")
+            checks[self.run_style_check] = "代码风格检查失败，但继续构建"
+            checks[self.run_type_check] = "类型检查失败，但继续构建"
+        if not skip_tests:
+            checks[self.run_tests] = "测试失败，但继续构建"
+        if not checks:
+            return
+        
+        max_workers = min(len(checks), max(1, (os.cpu_count() or 1) - 2))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(check): message for check, message in checks.items()}
+            for future in as_completed(futures):
+                try:
+                    ok = future.result()
+                except Exception as e:
+                    self.log(f"检查执行异常: {e}", "ERROR")
+                    ok = False
+                if not ok:
+                    self.log(futures[future], "WARNING")
+    
     def run_tests(self) -> bool:
         """运行测试"""
         self.log("运行项目测试...")
@@ -156,7 +517,11 @@ class CorePublisher:
         # 检查是否有pytest
         try:
             import pytest
-            if not self.run_command([sys.executable, "-m", "pytest", "tests/", "-v"]):
+            command = [sys.executable, "-m", "pytest", "tests/", "-q"]
+            # 安装了pytest-xdist时按文件分片到多个进程并行执行
+            if importlib.util.find_spec("xdist") is not None:
+                command += ["-n", str(max(1, (os.cpu_count() or 1) - 2)), "--dist=loadfile"]
+            if not self._run_cached_check("pytest", lambda: self.run_command(command)):
                 self.log("测试失败，但继续构建", "WARNING")
                 return True  # 允许测试失败时继续构建
         except ImportError:
@@ -166,6 +531,10 @@ class CorePublisher:
     
     def build_basic_packages(self) -> bool:
         """构建基础包"""
+        return asyncio.run(self.build_basic_packages_async())
+    
+    async def build_basic_packages_async(self) -> bool:
+        """构建基础包（异步执行构建命令，可与其他不涉及构建目录的步骤同时进行）"""
         self.log("构建基础Python包...")
         
         # 清理之前的构建
@@ -173,16 +542,15 @@ class CorePublisher:
             shutil.rmtree(self.dist_dir)
         
         # 构建主包
-        if not self.run_command([sys.executable, "-m", "build"]):
-            return False
+        build_ok = await self.run_command_async([sys.executable, "-m", "build"])
         
-        # 构建API包
+        # 构建API包：与主包构建都会在项目目录下写入build和egg-info输出，需在主包构建完成后执行
         api_dir = self.project_root / "chs_core_api"
         if api_dir.exists() and (api_dir / "setup.py").exists():
-            if not self.run_command([sys.executable, "setup.py", "sdist", "bdist_wheel"], cwd=api_dir):
+            if not await self.run_command_async([sys.executable, "setup.py", "sdist", "bdist_wheel"], cwd=api_dir):
                 self.log("API包构建失败，但继续", "WARNING")
         
-        return True
+        return build_ok
     
     def build_protected_packages(self, protection_level: str = "bytecode") -> bool:
         """构建受保护的包"""
@@ -197,13 +565,7 @@ class CorePublisher:
             builder = ProtectedBuilder(self.project_root)
             
             # 设置保护级别
-            protection_config = {
-                "bytecode": {"api": "source", "core": "bytecode", "algorithms": "bytecode"},
-                "obfuscated": {"api": "source", "core": "obfuscated", "algorithms": "obfuscated"},
-                "all": {"api": "source", "core": "obfuscated", "algorithms": "encrypted"}
-            }
-            
-            config = protection_config.get(protection_level, protection_config["bytecode"])
+            config = _PROTECTION_CONFIG.get(protection_level, _PROTECTION_CONFIG["bytecode"])
             
             # 执行保护构建
             if not builder.build_all(config):
@@ -247,61 +609,91 @@ class CorePublisher:
             self.log(f"分层打包异常: {e}", "ERROR")
             return True  # 非关键错误，继续
     
-    def copy_to_release_dir(self) -> bool:
-        """复制到发布目录"""
+    def _create_release_structure(self) -> Dict[str, Path]:
+        """创建发布目录结构"""
+        release_structure = {
+            "packages": self.target_dir / "packages",
+            "docs": self.target_dir / "docs", 
+            "scripts": self.target_dir / "scripts",
+            "examples": self.target_dir / "examples"
+        }
+        
+        for dir_path in release_structure.values():
+            dir_path.mkdir(parents=True, exist_ok=True)
+        
+        return release_structure
+    
+    def _collect_static_files(self, release_structure: Dict[str, Path]) -> List[Tuple[str, str]]:
+        """收集与构建结果无关的待复制文件（文档、脚本和重要文件）"""
+        copy_pairs = []
+        
+        # 文档
+        if os.path.isdir(self._docs_src):
+            copy_pairs.extend(_collect_tree_files(self._docs_src, release_structure["docs"], ignore=DOCS_IGNORE))
+        
+        # 脚本
+        if os.path.isdir(self._scripts_src):
+            scripts_target = str(release_structure["scripts"])
+            with os.scandir(self._scripts_src) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith(".py"):
+                        copy_pairs.append((entry.path, os.path.join(scripts_target, entry.name)))
+        
+        # 重要文件
+        project_root, target_dir = str(self.project_root), str(self.target_dir)
+        important_files = ["README.md", "requirements.txt", "setup.py"]
+        for file_name in important_files:
+            source_file = os.path.join(project_root, file_name)
+            if os.path.exists(source_file):
+                copy_pairs.append((source_file, os.path.join(target_dir, file_name)))
+        
+        return copy_pairs
+    
+    def copy_static_files(self) -> bool:
+        """复制文档、脚本和重要文件到发布目录（不依赖构建结果，可与构建同时进行）"""
+        self.log(f"复制文档和脚本到发布目录: {self.target_dir}...")
+        
+        try:
+            _copy_files_parallel(self._collect_static_files(self._create_release_structure()))
+            return True
+        
+        except Exception as e:
+            self.log(f"复制文档和脚本失败: {e}", "ERROR")
+            return False
+    
+    def copy_to_release_dir(self, include_static: bool = True) -> bool:
+        """复制到发布目录
+        
+        include_static为False时只复制构建结果，文档和脚本由copy_static_files单独复制。
+        """
         self.log(f"复制构建结果到发布目录: {self.target_dir}...")
         
         try:
-            # 创建发布目录结构
-            release_structure = {
-                "packages": self.target_dir / "packages",
-                "docs": self.target_dir / "docs", 
-                "scripts": self.target_dir / "scripts",
-                "examples": self.target_dir / "examples"
-            }
+            release_structure = self._create_release_structure()
             
-            for dir_path in release_structure.values():
-                dir_path.mkdir(parents=True, exist_ok=True)
+            # 先收集所有待复制的 (源文件, 目标文件)，最后统一并行复制
+            copy_pairs = self._collect_static_files(release_structure) if include_static else []
             
-            # 复制包文件
+            # 包文件
             if self.dist_dir.exists():
-                for file in self.dist_dir.glob("*"):
-                    if file.is_file():
-                        shutil.copy2(file, release_structure["packages"])
-                        self.log(f"复制包文件: {file.name}")
+                packages_target = str(release_structure["packages"])
+                with os.scandir(self.dist_dir) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            copy_pairs.append((entry.path, os.path.join(packages_target, entry.name)))
+                            self.log(f"复制包文件: {entry.name}")
             
-            # 复制分层包
+            # 分层包
             if self.build_dir.exists():
                 for package_dir in self.build_dir.glob("chs-core-*"):
                     if package_dir.is_dir():
                         target_package_dir = release_structure["packages"] / package_dir.name
-                        if target_package_dir.exists():
-                            shutil.rmtree(target_package_dir)
-                        shutil.copytree(package_dir, target_package_dir)
+                        if self.clean:
+                            shutil.rmtree(target_package_dir, ignore_errors=True)
+                        copy_pairs.extend(_collect_tree_files(package_dir, target_package_dir))
                         self.log(f"复制分层包: {package_dir.name}")
             
-            # 复制文档
-            docs_source = self.project_root / "docs"
-            if docs_source.exists():
-                for item in docs_source.rglob("*"):
-                    if item.is_file() and not item.name.startswith("."):
-                        rel_path = item.relative_to(docs_source)
-                        target_path = release_structure["docs"] / rel_path
-                        target_path.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(item, target_path)
-            
-            # 复制脚本
-            scripts_source = self.project_root / "scripts"
-            if scripts_source.exists():
-                for item in scripts_source.glob("*.py"):
-                    shutil.copy2(item, release_structure["scripts"])
-            
-            # 复制重要文件
-            important_files = ["README.md", "requirements.txt", "setup.py"]
-            for file_name in important_files:
-                source_file = self.project_root / file_name
-                if source_file.exists():
-                    shutil.copy2(source_file, self.target_dir)
+            _copy_files_parallel(copy_pairs)
             
             # 生成发布信息
             release_info = {
@@ -309,12 +701,16 @@ class CorePublisher:
                 "version": self.config["version"],
                 "build_time": self.config["build_timestamp"],
                 "protection_enabled": self.config["protection_enabled"],
-                "packages": list(release_structure["packages"].glob("*")),
+                "packages": [str(path) for path in release_structure["packages"].glob("*")],
                 "build_log": str(self.log_file)
             }
             
-            with open(self.target_dir / "release_info.json", "w", encoding="utf-8") as f:
-                json.dump(release_info, f, indent=2, ensure_ascii=False, default=str)
+            if orjson is not None:
+                with open(self.target_dir / "release_info.json", "wb") as f:
+                    f.write(orjson.dumps(release_info, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.target_dir / "release_info.json", "w", encoding="utf-8") as f:
+                    f.write(json.dumps(release_info, indent=2, ensure_ascii=False))
             
             return True
             
@@ -322,22 +718,78 @@ class CorePublisher:
             self.log(f"复制到发布目录失败: {e}", "ERROR")
             return False
     
-    def cleanup(self):
-        """清理临时文件"""
+    def cleanup(self) -> threading.Thread:
+        """清理临时文件
+        
+        待删除的目录先重命名移出原位置，再由后台线程并行删除，发布流程无需等待删除完成；
+        进程退出前会等待后台删除结束。
+        
+        Returns:
+            threading.Thread: 执行删除的后台线程
+        """
         self.log("清理临时文件...")
         
         cleanup_dirs = [
             self.project_root / "build",
-            self.project_root / "*.egg-info"
+            *self.project_root.glob("*.egg-info"),
+            # 上次未删除完的目录
+            *self.project_root.glob(f"*{TRASH_SUFFIX}*")
         ]
         
-        for pattern in cleanup_dirs:
-            if "*" in str(pattern):
-                for path in self.project_root.glob(pattern.name):
-                    if path.is_dir():
-                        shutil.rmtree(path)
-            elif pattern.exists():
-                shutil.rmtree(pattern)
+        targets = []
+        for path in cleanup_dirs:
+            if not path.is_dir():
+                continue
+            if TRASH_SUFFIX in path.name:
+                targets.append(path)
+                continue
+            trash = path.with_name(f"{path.name}{TRASH_SUFFIX}{os.getpid()}")
+            try:
+                os.rename(path, trash)
+                targets.append(trash)
+            except OSError:
+                # 无法重命名（如Windows上文件被占用）时直接删除原目录
+                targets.append(path)
+        
+        # 检查结果缓存随构建目录一起被移走，重新写回
+        if self._check_cache:
+            with self._check_cache_lock:
+                self._save_check_cache()
+        
+        def remove_targets():
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda target: shutil.rmtree(target, ignore_errors=True), targets))
+        
+        thread = threading.Thread(target=remove_targets, name="publish-cleanup")
+        thread.start()
+        return thread
+    
+    async def _build_and_stage(self, protection_level: str) -> bool:
+        """构建包并创建分层包，同时复制文档和脚本
+        
+        保护构建会清理构建目录，而分层包写入同一构建目录，因此构建与分层打包依次执行；
+        静态文件复制只写发布目录，与二者同时进行。
+        """
+        loop = asyncio.get_running_loop()
+        
+        async def build_then_layer() -> Tuple[bool, bool]:
+            if protection_level == "none":
+                build_ok = await self.build_basic_packages_async()
+            else:
+                build_ok = await loop.run_in_executor(None, self.build_protected_packages, protection_level)
+            layered_ok = await loop.run_in_executor(None, self.create_layered_packages)
+            return build_ok, layered_ok
+        
+        static = loop.run_in_executor(None, self.copy_static_files)
+        
+        (build_ok, layered_ok), static_ok = await asyncio.gather(build_then_layer(), static)
+        
+        if not build_ok:
+            self.log("基础包构建失败" if protection_level == "none" else "保护包构建失败", "ERROR")
+        if not layered_ok:
+            self.log("分层包创建失败，但继续", "WARNING")
+        
+        return build_ok and static_ok
     
     def publish(self, protection_level: str = "bytecode", skip_tests: bool = False, 
                 skip_quality: bool = False) -> bool:
@@ -353,30 +805,15 @@ class CorePublisher:
                 self.log("依赖检查失败", "ERROR")
                 return False
             
-            # 2. 代码质量检查
-            if not skip_quality and not self.run_quality_checks():
-                self.log("质量检查失败，但继续构建", "WARNING")
-            
-            # 3. 运行测试
-            if not skip_tests and not self.run_tests():
-                self.log("测试失败，但继续构建", "WARNING")
-            
-            # 4. 构建包
-            if protection_level == "none":
-                if not self.build_basic_packages():
-                    self.log("基础包构建失败", "ERROR")
-                    return False
-            else:
-                if not self.build_protected_packages(protection_level):
-                    self.log("保护包构建失败", "ERROR")
-                    return False
+            # 2-3. 代码质量检查与运行测试（并行执行）
+            self.run_checks_parallel(skip_tests=skip_tests, skip_quality=skip_quality)
             
-            # 5. 创建分层包
-            if not self.create_layered_packages():
-                self.log("分层包创建失败，但继续", "WARNING")
+            # 4-5. 构建包、创建分层包，同时复制文档和脚本
+            if not asyncio.run(self._build_and_stage(protection_level)):
+                return False
             
-            # 6. 复制到发布目录
-            if not self.copy_to_release_dir():
+            # 6. 复制构建结果到发布目录
+            if not self.copy_to_release_dir(include_static=False):
                 self.log("复制到发布目录失败", "ERROR")
                 return False
             
@@ -417,6 +854,11 @@ def main():
         action="store_true", 
         help="跳过代码质量检查"
     )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="复制前清空发布目录中已有的分层包"
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -430,7 +872,7 @@ def main():
     target_dir = Path(args.target_dir)
     
     # 创建发布器
-    publisher = CorePublisher(project_root, target_dir)
+    publisher = CorePublisher(project_root, target_dir, clean=args.clean)
     
     # 执行发布
     success = publisher.publish(
@@ -45,9 +45,7 @@ def copy_packages(project_root, release_dirs):
     api_dir = project_root / 'chs_core_api'
     if api_dir.exists():
         api_target = packages_dir / 'chs_core_api'
-        if api_target.exists():
-            shutil.rmtree(api_target)
-        shutil.copytree(api_dir, api_target)
+        shutil.copytree(api_dir, api_target, dirs_exist_ok=True)
         print(f"复制API包: chs_core_api")
 
 def copy_docs(project_root, release_dirs):
@@ -56,12 +54,10 @@ def copy_docs(project_root, release_dirs):
     docs_target = release_dirs['docs']
     
     if docs_source.exists():
-        for item in docs_source.rglob('*'):
-            if item.is_file() and not item.name.startswith('.'):
-                rel_path = item.relative_to(docs_source)
-                target_path = docs_target / rel_path
-                target_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(item, target_path)
+        # 忽略模式在目录层面生效，隐藏目录和__pycache__不会被遍历
+        shutil.copytree(docs_source, docs_target,
+                        ignore=shutil.ignore_patterns('.*', '__pycache__', '*.pyc'),
+                        dirs_exist_ok=True)
         print(f"复制文档目录")
 
 def copy_scripts(project_root, release_dirs):
@@ -70,13 +66,15 @@ def copy_scripts(project_root, release_dirs):
     scripts_target = release_dirs['scripts']
     
     if scripts_source.exists():
-        for item in scripts_source.glob('*.py'):
-            shutil.copy2(item, scripts_target)
-            print(f"复制脚本: {item.name}")
-        
-        for item in scripts_source.glob('*.json'):
-            shutil.copy2(item, scripts_target)
-            print(f"复制配置: {item.name}")
+        # 单次遍历目录，按扩展名区分脚本和配置
+        with os.scandir(scripts_source) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(('.py', '.json')):
+                    shutil.copy2(entry.path, scripts_target / entry.name)
+                    if entry.name.endswith('.py'):
+                        print(f"复制脚本: {entry.name}")
+                    else:
+                        print(f"复制配置: {entry.name}")
 
 def copy_root_files(project_root, target_dir):
     """复制根目录重要文件"""
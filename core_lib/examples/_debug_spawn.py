@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+调试脚本共用的子进程测试工具
+
+debug_exact_test.py 和 debug_traditional_test.py 通过本模块以子进程方式运行示例，
+行为与测试脚本的 run_command_test 方法一致。
+"""
+
+import subprocess
+import time
+import os
+import threading
+from collections import deque
+from pathlib import Path
+
+# 子进程环境变量，强制使用UTF-8编码；只在导入时构建一次，各调用共用且不再修改
+CHILD_ENV = {**os.environ, 'PYTHONIOENCODING': 'utf-8', 'PYTHONUTF8': '1'}
+
+# 示例目录（即 run_scenario.py 所在目录），导入时解析一次
+EXAMPLES_DIR = str(Path(__file__).parent.resolve())
+
+# 子进程输出只保留末尾的行数，避免长时间仿真的全部输出驻留内存
+OUTPUT_TAIL_LINES = 4096
+
+def _drain(stream, tail, length):
+    """读取子进程输出流直到结束，只在 tail 中保留末尾若干行，length[0] 累计总字节数"""
+    for line in stream:
+        tail.append(line)
+        length[0] += len(line)
+    stream.close()
+
+def clean_output(raw):
+    """解码子进程输出字节；只有确实包含NUL时才做替换，空输出直接返回"""
+    if not raw:
+        return ""
+    if b'\x00' in raw:
+        raw = raw.replace(b'\x00', b'')
+    return raw.decode('utf-8', errors='replace').strip()
+
+def run_command_test(command, test_name, timeout=120, *, cwd=None):
+    """
+    完全模拟测试脚本的 run_command_test 方法
+    
+    Args:
+        command: 要执行的命令列表
+        test_name: 测试名称
+        timeout: 超时时间（秒）
+        cwd: 子进程工作目录，默认为示例目录
+    
+    Returns:
+        (是否成功, 输出, 执行时间)
+    """
+    cwd = cwd or EXAMPLES_DIR
+    print(f"\n=== Testing {test_name} ===")
+    print(f"Command: {' '.join(command)}")
+    print(f"Working directory: {cwd}")
+    print(f"Timeout setting: {timeout} seconds")
+    print("Starting execution...")
+    
+    start_time = time.perf_counter()
+    try:
+        # 输出由读取线程边读边丢弃，只保留末尾若干行
+        proc = subprocess.Popen(
+            command,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=CHILD_ENV  # 传递环境变量
+        )
+        tail_out, tail_err = deque(maxlen=OUTPUT_TAIL_LINES), deque(maxlen=OUTPUT_TAIL_LINES)
+        out_len, err_len = [0], [0]
+        readers = [
+            threading.Thread(target=_drain, args=(proc.stdout, tail_out, out_len), daemon=True),
+            threading.Thread(target=_drain, args=(proc.stderr, tail_err, err_len), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        try:
+            returncode = proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            for reader in readers:
+                reader.join()
+        
+        end_time = time.perf_counter()
+        execution_time = end_time - start_time
+        
+        print(f"Execution completed, time taken: {execution_time:.2f} seconds")
+        print(f"Return code: {returncode}")
+        print(f"Standard output length: {out_len[0]} bytes")
+        print(f"Standard error length: {err_len[0]} bytes")
+        
+        # 清理输出中的特殊字符，避免乱码
+        clean_stdout = clean_output(b''.join(tail_out))
+        clean_stderr = clean_output(b''.join(tail_err))
+        
+        if returncode == 0:
+            print("✓ Test passed")
+            if clean_stdout:
+                print(f"Standard output: {clean_stdout[:200]}..." if len(clean_stdout) > 200 else f"Standard output: {clean_stdout}")
+            return True, clean_stdout, execution_time
+        else:
+            print(f"✗ Test failed (return code: {returncode})")
+            error_output = clean_stderr or clean_stdout or "No error output"
+            if error_output:
+                print(f"Error output: {error_output[:200]}..." if len(error_output) > 200 else f"Error output: {error_output}")
+            return False, error_output, execution_time
+            
+    except subprocess.TimeoutExpired:
+        execution_time = time.perf_counter() - start_time
+        print(f"✗ Test timeout (>{timeout} seconds)")
+        return False, "Test timeout", execution_time
+    except Exception as e:
+        execution_time = time.perf_counter() - start_time
+        print(f"✗ Test exception: {e}")
+        return False, str(e), execution_time
@@ -98,22 +98,6 @@ def setup_hierarchical_control_system(harness):
     )
 
     # --- Central Dispatcher with Corrected Message Key ---
-    dispatcher_rules = {
-        "profiles": {
-            "flood_control": {
-                "condition": lambda states: states.get('reservoir_level', {}).get('water_level', 0) > 18.0,
-                "commands": {
-                    "gate1_command": {'new_setpoint': 12.0}
-                }
-            },
-            "normal_operation": {
-                "condition": lambda states: True,
-                "commands": {
-                    "gate1_command": {'new_setpoint': 15.0}
-                }
-            }
-        }
-    }
     dispatcher = CentralDispatcherAgent(
         agent_id="dispatcher_1",
         message_bus=message_bus,
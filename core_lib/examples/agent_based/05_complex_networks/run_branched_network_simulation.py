@@ -102,14 +102,6 @@ def run_branched_network_simulation():
     )
 
     # This dispatcher is for monitoring; its rules won't trigger in this scenario
-    dispatcher_rules = {
-        "profiles": {
-            "default": {
-                "condition": lambda states: True,
-                "commands": {}
-            }
-        }
-    }
     dispatcher = CentralDispatcherAgent(
         agent_id="central_dispatcher",
         message_bus=message_bus,
@@ -4,73 +4,100 @@
 精确模拟测试脚本行为的调试脚本
 """
 
-import subprocess
 import time
 import os
-from pathlib import Path
+import io
+import sys
+import signal
+import threading
+import _thread
+import contextlib
 
-def run_command_test(command, test_name, timeout=120):
-    """完全模拟测试脚本的 run_command_test 方法"""
-    examples_dir = Path.cwd()
+from _debug_spawn import EXAMPLES_DIR, run_command_test
+
+
+class ExampleTimeout(BaseException):
+    """进程内运行示例超时；继承BaseException，避免被 run_example 内部的 except Exception 吞掉"""
+
+
+@contextlib.contextmanager
+def time_limit(seconds):
+    """
+    限制代码块的运行时间，超时抛出 ExampleTimeout
     
-    print(f"\n=== Testing {test_name} ===")
-    print(f"Command: {' '.join(command)}")
-    print(f"Working directory: {examples_dir}")
+    POSIX 上使用 SIGALRM 定时器；其他平台由看门狗线程调用 _thread.interrupt_main()
+    中断主线程，再把 KeyboardInterrupt 转换为 ExampleTimeout。
+    """
+    if hasattr(signal, "setitimer"):
+        def _on_alarm(signum, frame):
+            raise ExampleTimeout()
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    else:
+        fired = threading.Event()
+        def _on_timeout():
+            fired.set()
+            _thread.interrupt_main()
+        watchdog = threading.Timer(seconds, _on_timeout)
+        watchdog.daemon = True
+        watchdog.start()
+        try:
+            yield
+        except KeyboardInterrupt:
+            if fired.is_set():
+                raise ExampleTimeout()
+            raise
+        finally:
+            watchdog.cancel()
+
+def run_example_in_process(example_key, timeout=120):
+    """
+    在当前进程内直接调用 ExamplesScenarioRunner.run_example 运行示例
+    
+    省去子进程的解释器启动和UTF-8管道编解码，返回值与 run_command_test 一致。
+    
+    Args:
+        example_key: 示例键名
+        timeout: 超时时间（秒）
+    
+    Returns:
+        (是否成功, 输出, 执行时间)
+    """
+    print(f"\n=== Testing Traditional Scenario: {example_key} (in-process) ===")
     print(f"Timeout setting: {timeout} seconds")
     print("Starting execution...")
     
-    start_time = time.time()
+    buf = io.StringIO()
+    saved_cwd = os.getcwd()
+    start_time = time.perf_counter()
     try:
-        # 设置子进程环境变量，强制使用UTF-8编码
-        env = os.environ.copy()
-        env['PYTHONIOENCODING'] = 'utf-8'
-        env['PYTHONUTF8'] = '1'
-        
-        # 使用subprocess.run来简化处理并确保正确的编码
-        result = subprocess.run(
-            command,
-            cwd=str(examples_dir),
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            check=False,
-            encoding='utf-8',
-            errors='replace',  # 替换无法解码的字符，避免乱码
-            env=env  # 传递环境变量
-        )
-        
-        end_time = time.time()
-        execution_time = end_time - start_time
-        
-        print(f"Execution completed, time taken: {execution_time:.2f} seconds")
-        print(f"Return code: {result.returncode}")
-        print(f"Standard output length: {len(result.stdout)} characters")
-        print(f"Standard error length: {len(result.stderr)} characters")
-        
-        # 清理输出中的特殊字符，避免乱码
-        clean_stdout = result.stdout.replace('\x00', '').strip() if result.stdout else ""
-        clean_stderr = result.stderr.replace('\x00', '').strip() if result.stderr else ""
-        
-        if result.returncode == 0:
-            print(f"✓ Test passed")
-            if clean_stdout:
-                print(f"Standard output: {clean_stdout[:200]}..." if len(clean_stdout) > 200 else f"Standard output: {clean_stdout}")
-            return True, clean_stdout, execution_time
-        else:
-            print(f"✗ Test failed (return code: {result.returncode})")
-            error_output = clean_stderr or clean_stdout or "No error output"
-            if error_output:
-                print(f"Error output: {error_output[:200]}..." if len(error_output) > 200 else f"Error output: {error_output}")
-            return False, error_output, execution_time
-            
-    except subprocess.TimeoutExpired:
-        execution_time = time.time() - start_time
+        with contextlib.redirect_stdout(buf), contextlib.redirect_stderr(buf), time_limit(timeout):
+            if EXAMPLES_DIR not in sys.path:
+                sys.path.insert(0, EXAMPLES_DIR)
+            from run_scenario import ExamplesScenarioRunner
+            success = ExamplesScenarioRunner().run_example(example_key)
+    except ExampleTimeout:
+        execution_time = time.perf_counter() - start_time
         print(f"✗ Test timeout (>{timeout} seconds)")
         return False, "Test timeout", execution_time
-    except Exception as e:
-        execution_time = time.time() - start_time
+    except (Exception, SystemExit) as e:
+        # run_scenario 在导入失败时会调用 sys.exit
+        execution_time = time.perf_counter() - start_time
         print(f"✗ Test exception: {e}")
-        return False, str(e), execution_time
+        return False, buf.getvalue().strip() or str(e), execution_time
+    finally:
+        os.chdir(saved_cwd)
+    
+    execution_time = time.perf_counter() - start_time
+    output = buf.getvalue().replace('\x00', '').strip()
+    print(f"Execution completed, time taken: {execution_time:.2f} seconds")
+    print(f"✓ Test passed" if success else "✗ Test failed")
+    return success, output, execution_time
 
 def main():
     print("🔍 精确模拟测试脚本行为")
@@ -78,9 +105,13 @@ def main():
     
     # 测试 agent_based_06_centralized_emergency_override
     example_key = "agent_based_06_centralized_emergency_override"
-    command = ["python", "-u", "run_scenario.py", "--example", example_key]
     
-    success, output, exec_time = run_command_test(command, f"Traditional Scenario: {example_key}", timeout=120)
+    if "--subprocess" in sys.argv[1:]:
+        # 与测试脚本完全一致：在独立子进程中运行
+        command = ["python", "-u", "run_scenario.py", "--example", example_key]
+        success, output, exec_time = run_command_test(command, f"Traditional Scenario: {example_key}", timeout=120)
+    else:
+        success, output, exec_time = run_example_in_process(example_key, timeout=120)
     
     print("\n" + "=" * 60)
     print("🎯 测试结果:")
@@ -7,6 +7,11 @@
 import sys
 from pathlib import Path
 
+# 示例目录（即 run_scenario.py 所在目录），导入时加入搜索路径一次
+EXAMPLES_DIR = str(Path(__file__).parent.resolve())
+if EXAMPLES_DIR not in sys.path:
+    sys.path.insert(0, EXAMPLES_DIR)
+
 def test_examples_discovery():
     """测试示例发现功能"""
     examples_dir = Path(__file__).parent
@@ -15,7 +20,6 @@ def test_examples_discovery():
     print(f"工作目录: {examples_dir}")
     
     # 导入 ExamplesScenarioRunner
-    sys.path.insert(0, str(examples_dir))
     from run_scenario import ExamplesScenarioRunner
     
     runner = ExamplesScenarioRunner()
@@ -45,12 +49,12 @@ def test_examples_discovery():
         # 检查其他必需文件
         example_dir = examples_dir / example_info['path']
         required_files = ['config.yml', 'components.yml', 'topology.yml', 'agents.yml']
+        # 读取一次目录得到已有的yml文件，替代逐个文件stat
+        present = {p.name for p in example_dir.iterdir() if p.suffix == '.yml'} if example_dir.is_dir() else set()
         
         print(f"\n  检查必需文件:")
         for file_name in required_files:
-            file_path = example_dir / file_name
-            exists = file_path.exists()
-            print(f"    {file_name}: {'✅' if exists else '❌'}")
+            print(f"    {file_name}: {'✅' if file_name in present else '❌'}")
             
     else:
         print(f"\n❌ 未找到目标示例: {target_example}")
@@ -4,77 +4,167 @@
 调试传统多配置文件方法测试的脚本
 """
 
-import subprocess
+import asyncio
+import contextlib
+import io
+import logging
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 import time
 
-def run_command_test(command, test_name, timeout=60):
-    """完全模拟测试脚本的 run_command_test 方法"""
-    examples_dir = Path(__file__).parent
+# 示例目录（即 run_scenario.py 所在目录），导入时加入搜索路径一次
+EXAMPLES_DIR = str(Path(__file__).parent.resolve())
+if EXAMPLES_DIR not in sys.path:
+    sys.path.insert(0, EXAMPLES_DIR)
+
+from _debug_spawn import CHILD_ENV, clean_output, run_command_test
+
+try:
+    from yaml import YAMLError
+except ImportError:
+    # 未安装PyYAML时不会产生YAML解析异常，缺失本身按ImportError处理
+    YAMLError = ImportError
+
+# 进程池工作进程中复用的场景运行器
+_runner = None
+# 工作进程初始化失败时的输出，由每个任务作为失败结果返回
+_init_error = None
+
+# 并行读取示例目录的线程数；scandir 期间释放GIL，网络文件系统上收益明显
+LISTING_WORKERS = 32
+
+# 传统多配置文件方法需要的配置文件
+REQUIRED_CONFIG_FILES = {'config.yml', 'components.yml', 'topology.yml', 'agents.yml'}
+
+def _existing_files(path):
+    """单次读取目录，返回其中的文件名集合；目录不存在时返回空集合"""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name for entry in it if entry.is_file()}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+async def run_command_test_async(command, timeout, semaphore):
+    """
+    run_command_test 的异步版本，用于并发运行多个示例
     
-    print(f"\n=== Testing {test_name} ===")
-    print(f"Command: {' '.join(command)}")
-    print(f"Working directory: {examples_dir}")
-    print(f"Timeout setting: {timeout} seconds")
-    print("Starting execution...")
+    Args:
+        command: 要执行的命令列表
+        timeout: 单个示例的超时时间（秒）
+        semaphore: 限制同时运行子进程数量的信号量
     
+    Returns:
+        (是否成功, 输出, 执行时间)
+    """
+    async with semaphore:
+        start_time = time.time()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *command,
+                cwd=EXAMPLES_DIR,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=CHILD_ENV
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return False, "Test timeout", time.time() - start_time
+        except Exception as e:
+            return False, str(e), time.time() - start_time
+        execution_time = time.time() - start_time
+    
+    # 清理输出中的特殊字符，避免乱码
+    clean_stdout = clean_output(stdout)
+    clean_stderr = clean_output(stderr)
+    
+    if proc.returncode == 0:
+        return True, clean_stdout, execution_time
+    return False, clean_stderr or clean_stdout or "No error output", execution_time
+
+async def run_examples_concurrently(test_examples, timeout=120):
+    """并发运行所有示例，同时运行的子进程数不超过CPU核数"""
+    semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+    keys = list(test_examples)
+    results = await asyncio.gather(*[
+        run_command_test_async(["python", "-u", "run_scenario.py", "--example", key], timeout, semaphore)
+        for key in keys
+    ])
+    
+    return print_sweep_results(test_examples, keys, results)
+
+def _worker_init():
+    """进程池工作进程初始化：只导入一次 run_scenario 并创建运行器"""
+    global _runner, _init_error
+    # run_scenario_from_config 内部的 basicConfig 会绑定首个任务重定向的 stderr，
+    # 这里预先配置，让日志始终写到工作进程自身的 stderr
+    logging.basicConfig(level=logging.INFO)
+    # run_scenario 导入失败时会调用 sys.exit；在初始化函数中抛出会使整个进程池失效
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf), contextlib.redirect_stderr(buf):
+            from run_scenario import ExamplesScenarioRunner
+            _runner = ExamplesScenarioRunner()
+    except (Exception, SystemExit) as e:
+        _init_error = buf.getvalue().strip() or str(e)
+
+def _worker_run(example_key):
+    """在工作进程内运行单个示例，返回 (是否成功, 输出, 执行时间)"""
+    if _runner is None:
+        return False, _init_error, 0.0
+    buf = io.StringIO()
     start_time = time.time()
     try:
-        # 设置子进程环境变量，强制使用UTF-8编码
-        env = os.environ.copy()
-        env['PYTHONIOENCODING'] = 'utf-8'
-        env['PYTHONUTF8'] = '1'
-        
-        # 使用subprocess.run来简化处理并确保正确的编码
-        result = subprocess.run(
-            command,
-            cwd=str(examples_dir),
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            check=False,
-            encoding='utf-8',
-            errors='replace',  # 替换无法解码的字符，避免乱码
-            env=env  # 传递环境变量
-        )
-        
-        end_time = time.time()
-        execution_time = end_time - start_time
-        
-        print(f"Execution completed, time taken: {execution_time:.2f} seconds")
-        print(f"Return code: {result.returncode}")
-        print(f"Standard output length: {len(result.stdout)} characters")
-        print(f"Standard error length: {len(result.stderr)} characters")
-        
-        # 清理输出中的特殊字符，避免乱码
-        clean_stdout = result.stdout.replace('\x00', '').strip() if result.stdout else ""
-        clean_stderr = result.stderr.replace('\x00', '').strip() if result.stderr else ""
-        
-        if result.returncode == 0:
-            print(f"✓ Test passed")
-            if clean_stdout:
-                print(f"Standard output: {clean_stdout[:200]}..." if len(clean_stdout) > 200 else f"Standard output: {clean_stdout}")
-            return True, clean_stdout, execution_time
+        with contextlib.redirect_stdout(buf), contextlib.redirect_stderr(buf):
+            success = _runner.run_example(example_key)
+    except (Exception, SystemExit) as e:
+        # 示例内部调用 sys.exit 时记为失败结果，不让其穿过进程池中断整个扫描
+        buf.write(f"\n{e}")
+        success = False
+    execution_time = time.time() - start_time
+    return success, buf.getvalue().replace('\x00', '').strip(), execution_time
+
+def run_examples_in_pool(test_examples):
+    """
+    在常驻工作进程池中运行所有示例
+    
+    每个工作进程只付出一次解释器启动和 run_scenario 导入的开销。run_example 会切换
+    工作目录，因此使用进程而不是线程。进程池无法中断单个超时的示例，需要超时控制时
+    使用子进程方式（--subprocess）。
+    """
+    keys = list(test_examples)
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_worker_init) as executor:
+        results = list(executor.map(_worker_run, keys))
+    return print_sweep_results(test_examples, keys, results)
+
+def print_sweep_results(test_examples, keys, results):
+    """按列表顺序打印每个示例的结果，全部通过时返回True"""
+    total = len(keys)
+    passed = 0
+    for i, (key, (success, output, exec_time)) in enumerate(zip(keys, results), 1):
+        desc = test_examples[key]['desc']
+        if success:
+            passed += 1
+            print(f"✅ [{i}/{total}] {desc} - 测试通过 ({exec_time:.2f}秒)")
         else:
-            print(f"✗ Test failed (return code: {result.returncode})")
-            error_output = clean_stderr or clean_stdout or "No error output"
-            if error_output:
-                print(f"Error output: {error_output[:200]}..." if len(error_output) > 200 else f"Error output: {error_output}")
-            return False, error_output, execution_time
-            
-    except subprocess.TimeoutExpired:
-        execution_time = time.time() - start_time
-        print(f"✗ Test timeout (>{timeout} seconds)")
-        return False, "Test timeout", execution_time
-    except Exception as e:
-        execution_time = time.time() - start_time
-        print(f"✗ Test exception: {e}")
-        return False, str(e), execution_time
+            print(f"❌ [{i}/{total}] {desc} - 测试失败 ({exec_time:.2f}秒)")
+            print(f"   失败输出: {output[:200]}..." if len(output) > 200 else f"   失败输出: {output}")
+    
+    print(f"\n通过 {passed}/{total} 个示例")
+    return passed == total
 
-def test_traditional_scenario_runner():
-    """完全模拟测试脚本的传统多配置文件方法测试"""
+def test_traditional_scenario_runner(run_all=False, use_subprocess=False):
+    """
+    完全模拟测试脚本的传统多配置文件方法测试
+    
+    Args:
+        run_all: 为True时运行测试列表中的全部示例，否则只测试目标示例
+        use_subprocess: 运行全部示例时为每个示例启动独立子进程，而不是复用进程池
+    """
     examples_dir = Path(__file__).parent
     
     print("=== 调试传统多配置文件方法测试 ===")
@@ -82,53 +172,45 @@ def test_traditional_scenario_runner():
     
     # 从run_scenario.py获取所有可用示例
     try:
-        sys.path.insert(0, str(examples_dir))
         from run_scenario import ExamplesScenarioRunner
         
         runner = ExamplesScenarioRunner()
         examples = runner.list_examples()
         
-        # 转换为测试格式，只包含有完整多配置文件的示例
+        # 各示例目录的读取互不依赖，先在线程池中并行列出所有目录
+        scenario_paths = {key: examples_dir / example['path'] for key, example in examples.items()}
+        with ThreadPoolExecutor(max_workers=LISTING_WORKERS) as executor:
+            listings = dict(zip(scenario_paths, executor.map(_existing_files, scenario_paths.values())))
+        
+        # 单次遍历：至少有config.yml和components.yml的为候选示例，
+        # 传统多配置文件方法还需要完整的配置文件结构
         test_examples = {}
+        candidates = 0
         for example_key, example in examples.items():
-            # 构建场景路径
-            scenario_path = examples_dir / example['path']
+            names = listings[example_key]
+            if not {'config.yml', 'components.yml'} <= names:
+                continue
+            candidates += 1
             
-            # 检查是否有传统多配置文件方法需要的文件
-            config_file = scenario_path / 'config.yml'
-            components_file = scenario_path / 'components.yml'
-            topology_file = scenario_path / 'topology.yml'
-            
-            # 只包含有完整多配置文件的示例（至少要有config.yml和components.yml）
-            if config_file.exists() and components_file.exists():
+            if REQUIRED_CONFIG_FILES <= names:
                 test_examples[example_key] = {
                     'desc': f"{example['name']} - {example['description']}",
-                    'path': str(scenario_path),
+                    'path': str(scenario_paths[example_key]),
                     'config': 'config.yml'
                 }
-        
-        print(f"\n找到 {len(test_examples)} 个符合条件的示例")
-        
-        # 验证这些示例确实存在且具有完整的多配置文件结构
-        filtered_examples = {}
-        for key, info in test_examples.items():
-            scenario_path = examples_dir / info['path']
-            config_file = scenario_path / 'config.yml'
-            components_file = scenario_path / 'components.yml'
-            topology_file = scenario_path / 'topology.yml'
-            agents_file = scenario_path / 'agents.yml'
-            
-            # 传统多配置文件方法需要完整的配置文件结构
-            if (config_file.exists() and components_file.exists() and 
-                topology_file.exists() and agents_file.exists()):
-                filtered_examples[key] = info
-                print(f"  ✅ {key}: 完整配置文件")
+                print(f"  ✅ {example_key}: 完整配置文件")
             else:
-                print(f"  ❌ {key}: 缺少配置文件")
-                
-        test_examples = filtered_examples
+                print(f"  ❌ {example_key}: 缺少配置文件")
+        
+        print(f"\n找到 {candidates} 个符合条件的示例")
         print(f"\n最终测试列表: {len(test_examples)} 个示例")
         
+        if run_all:
+            print(f"\n🔄 并发运行全部 {len(test_examples)} 个示例...")
+            if use_subprocess:
+                return asyncio.run(run_examples_concurrently(test_examples))
+            return run_examples_in_pool(test_examples)
+        
         # 检查 agent_based_06_centralized_emergency_override 是否在列表中
         target_example = "agent_based_06_centralized_emergency_override"
         if target_example in test_examples:
@@ -158,13 +240,15 @@ def test_traditional_scenario_runner():
                 print(f"  {key}")
             return False
             
-    except Exception as e:
+    except (ImportError, OSError, YAMLError) as e:
+        # 只处理环境和配置问题（模块缺失、目录不可读、场景YAML格式错误）；
+        # 其他异常直接抛出，由解释器打印完整堆栈
         print(f"❌ 测试过程中发生异常: {e}")
-        import traceback
-        traceback.print_exc()
         return False
 
 if __name__ == "__main__":
-    success = test_traditional_scenario_runner()
+    # 传入 --all 时并发运行所有符合条件的示例，加 --subprocess 则每个示例使用独立子进程
+    args = sys.argv[1:]
+    success = test_traditional_scenario_runner(run_all="--all" in args, use_subprocess="--subprocess" in args)
     print(f"\n最终结果: {'成功' if success else '失败'}")
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -20,11 +20,11 @@ sys.path.insert(0, str(project_root))
 
 import numpy as np
 import logging
+from functools import cached_property
 from typing import Dict, Any
 
 # 导入通用工具
 from core_lib.utils.simulation_builder import SimulationBuilder, PresetSimulations
-from core_lib.utils.visualization_utils import SimulationPlotter, quick_plot
 from core_lib.utils.performance_analysis import PerformanceAnalyzer, quick_analysis
 from core_lib.utils.example_utils import ExampleRunner, print_section_header, print_performance_summary
 
@@ -51,10 +51,15 @@ class SimplifiedReservoirControlExample(ExampleRunner):
             'setpoint': 12.0
         }
         
-        # 初始化工具
-        self.plotter = SimulationPlotter()
+        # 初始化工具（绘图器在首次使用时创建）
         self.analyzer = PerformanceAnalyzer(dt=self.simulation_params['dt'])
     
+    @cached_property
+    def plotter(self):
+        """绘图器，延迟导入可视化模块，避免不绘图时加载matplotlib"""
+        from core_lib.utils.visualization_utils import SimulationPlotter
+        return SimulationPlotter()
+    
     def setup_simulation(self) -> SimulationBuilder:
         """
         设置仿真系统
@@ -109,14 +114,15 @@ class SimplifiedReservoirControlExample(ExampleRunner):
         reservoir_data = results.get('reservoir_water_level', [])
         gate_data = results.get('gate_opening', [])
         
-        if not time_data or not reservoir_data:
+        # 用len判断而不是真值判断，结果为numpy数组时同样适用
+        if len(time_data) == 0 or len(reservoir_data) == 0:
             logger.warning("仿真结果数据不完整")
             return {}
         
-        # 转换为numpy数组
-        time = np.array(time_data)
-        water_level = np.array(reservoir_data)
-        gate_opening = np.array(gate_data) if gate_data else None
+        # 转换为numpy数组，已是float64数组时不再复制
+        time = np.asarray(time_data, dtype=np.float64)
+        water_level = np.asarray(reservoir_data, dtype=np.float64)
+        gate_opening = np.asarray(gate_data, dtype=np.float64) if gate_data is not None and len(gate_data) > 0 else None
         
         # 控制性能分析
         control_metrics = self.analyzer.calculate_control_metrics(
@@ -178,6 +184,8 @@ class SimplifiedReservoirControlExample(ExampleRunner):
         water_level = analysis_results['water_level']
         gate_opening = analysis_results['gate_opening']
         control_metrics = analysis_results['control_metrics']
+        # 没有闸门数据时各图共用同一条零序列
+        gate_series = gate_opening if gate_opening is not None else np.zeros_like(time)
         
         # 1. 控制性能图
         self.plotter.plot_control_performance(
@@ -192,7 +200,7 @@ class SimplifiedReservoirControlExample(ExampleRunner):
         # 2. 时间序列图
         time_series_data = {
             '水位 (m)': water_level,
-            '闸门开度': gate_opening if gate_opening is not None else np.zeros_like(water_level)
+            '闸门开度': gate_series
         }
         
         self.plotter.plot_time_series(
@@ -225,7 +233,7 @@ class SimplifiedReservoirControlExample(ExampleRunner):
                 'time': time,
                 '水位': water_level,
                 '设定值': np.full_like(time, self.simulation_params['setpoint']),
-                '闸门开度': gate_opening if gate_opening is not None else np.zeros_like(time)
+                '闸门开度': gate_series
             },
             'metrics': {
                 'RMSE': control_metrics.rmse,
@@ -233,7 +241,7 @@ class SimplifiedReservoirControlExample(ExampleRunner):
                 '超调量': control_metrics.overshoot,
                 '稳定性': analysis_results['stability_metrics']['stability_index']
             },
-            'control_signals': gate_opening if gate_opening is not None else np.zeros_like(time),
+            'control_signals': gate_series,
             'system_state': {
                 '正常运行': 0.8,
                 '调节中': 0.15,
@@ -303,14 +311,24 @@ def demonstrate_quick_tools():
     """
     print_section_header("快速工具演示")
     
-    # 生成示例数据
-    time = np.linspace(0, 100, 1000)
+    # 生成示例数据，时间轴以外的三条序列共用一块预分配内存
+    n_points = 1000
+    time = np.linspace(0, 100, n_points)
     setpoint = 12.0
-    noise = np.random.normal(0, 0.1, len(time))
+    response, control_signal, noise = np.empty((3, n_points))
+    np.random.default_rng().standard_normal(out=noise)
+    noise *= 0.1
     
-    # 模拟阶跃响应
-    response = setpoint * (1 - np.exp(-time/20)) + noise
-    control_signal = np.exp(-time/30) * 0.8
+    # 模拟阶跃响应: setpoint * (1 - exp(-t/20)) + noise，逐步原地计算
+    np.divide(time, -20.0, out=response)
+    np.exp(response, out=response)
+    np.subtract(1.0, response, out=response)
+    response *= setpoint
+    response += noise
+    # 控制信号: exp(-t/30) * 0.8
+    np.divide(time, -30.0, out=control_signal)
+    np.exp(control_signal, out=control_signal)
+    control_signal *= 0.8
     
     # 快速分析
     analysis = quick_analysis(response, setpoint=setpoint, dt=0.1)
@@ -324,6 +342,7 @@ def demonstrate_quick_tools():
     print(f"  稳态误差: {analysis['control'].steady_state_error:.3f}")
     
     # 快速绘图
+    from core_lib.utils.visualization_utils import quick_plot
     output_dir = Path(__file__).parent / 'output'
     output_dir.mkdir(exist_ok=True)
     